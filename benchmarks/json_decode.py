@@ -0,0 +1,79 @@
+"""
+JSON decoding benchmark - how long each decoder takes on the bodies of
+the endpoints with the largest payloads.
+
+The bodies are the ones a MockServer sends, or, with --replay, the ones
+recorded from the real servers with MockServer(record=...). Each
+decoder of scratchapi2.jsondecode that is installed is timed on the
+bytes, next to what requests' .json() did before (decode the bytes to
+text, then parse the text).
+
+    python benchmarks/json_decode.py [--replay fixtures.json] [--json]
+"""
+import argparse
+import json
+import sys
+import timeit
+sys.path.insert(0, ".")
+# pylint: disable=wrong-import-position
+import requests
+from scratchapi2 import Transport
+from scratchapi2.jsondecode import DECODERS
+from scratchapi2.mock import MockServer
+
+ENDPOINTS = (
+    "https://api.scratch.mit.edu/proxy/featured",
+    "https://scratch.mit.edu/statistics/data/monthly/",
+    "https://api.scratch.mit.edu/users/griffpatch/projects?limit=40&offset=0",
+    "https://api.scratch.mit.edu/projects/104/comments?limit=40&offset=0",
+    "https://api.scratch.mit.edu/projects/104",
+    "https://translate-service.scratch.mit.edu/supported?language=en",
+)
+
+def _requests_json(body):
+    """What Response.json() does with body."""
+    resp = requests.Response()
+    resp._content = body # pylint: disable=protected-access
+    resp.encoding = None
+    return resp.json()
+
+def bodies(replay=None):
+    """Return {url: body} for ENDPOINTS, from a MockServer."""
+    with MockServer(replay=replay) as server:
+        transport = Transport(base_urls=server.base_urls)
+        return {url: transport.get(url).content for url in ENDPOINTS}
+
+def measure(body, loads, repeat=5):
+    """Return the best seconds per call of loads(body)."""
+    number = max(1, 2000000 // max(len(body), 1))
+    return min(timeit.repeat(lambda: loads(body), number=number,
+                             repeat=repeat)) / number
+
+def main():
+    """Time every decoder on every body, and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--replay", help="a MockServer recording to use")
+    parser.add_argument("--json", action="store_true",
+                        help="print the results as JSON")
+    args = parser.parse_args()
+    decoders = {"requests .json()": _requests_json}
+    decoders.update((name, loads) for name, loads in DECODERS.items()
+                    if loads is not None)
+    results = {}
+    for url, body in bodies(args.replay).items():
+        path = url.split("/", 3)[3]
+        results[path] = {"bytes": len(body)}
+        for name, loads in decoders.items():
+            results[path][name] = measure(body, loads)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print("{0:48} {1:>8}".format("endpoint", "bytes")
+          + "".join("{0:>18}".format(name) for name in decoders))
+    for path, result in results.items():
+        print("{0:48} {1:>8}".format(path[:48], result["bytes"])
+              + "".join("{0:>15.1f} us".format(result[name] * 1e6)
+                        for name in decoders))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Memory benchmark - how much RAM a crawl holding many objects takes.
+
+Compares the slotted Project (and its author User), Studio, Classroom
+(and its educator) and Comment (and its author) with the layout they
+had before: every field, alias and link string in the instance
+__dict__. GenericData, which cannot have slots, is compared with its
+old update of __dict__. Nothing is requested; the objects are made from
+listing payloads. What the identity map takes for the slotted models is
+counted too.
+
+    python benchmarks/memory.py [count]
+"""
+import sys
+import tracemalloc
+sys.path.insert(0, ".")
+# pylint: disable=wrong-import-position
+from scratchapi2 import Project, Studio, Classroom, GenericData
+from scratchapi2.user import Comment
+
+PAYLOAD = {
+    "id": 0,
+    "title": "Scratch Platformer",
+    "description": "Use the arrow keys to move.",
+    "instructions": "Reach the flag without touching the lava!",
+    "visibility": "visible",
+    "public": True,
+    "comments_allowed": True,
+    "image": "https://cdn2.scratch.mit.edu/get_image/project/0_480x360.png",
+    "author": {
+        "id": 1882674,
+        "username": "griffpatch",
+        "scratchteam": False,
+        "history": {"joined": "2012-10-24T13:42:20.000Z"},
+        "profile": {"images": {}, "status": "", "bio": "", "country": ""},
+    },
+    "history": {
+        "created": "2019-01-01T00:00:00.000Z",
+        "modified": "2019-01-02T00:00:00.000Z",
+        "shared": "2019-01-02T00:00:00.000Z",
+    },
+    "stats": {"views": 1000, "loves": 100, "favorites": 90,
+              "comments": 10, "remixes": 5},
+    "remix": {"parent": None, "root": None},
+}
+
+class _DictUser(object):
+    """A User the way it was stored before: everything in __dict__."""
+
+    def __init__(self, user):
+        self.__dict__.update(
+            username=user["username"], userid=user["id"],
+            joined=user["history"]["joined"],
+            images=user["profile"]["images"],
+            status=user["profile"]["status"], bio=user["profile"]["bio"],
+            country=user["profile"]["country"],
+            scratchteam=user["scratchteam"],
+            joined_at=user["history"]["joined"],
+            about_me=user["profile"]["status"],
+            what_im_working_on=user["profile"]["bio"],
+            what_working_on=user["profile"]["bio"],
+        )
+
+class _DictProject(object):
+    """A Project the way it was stored before: everything in __dict__."""
+
+    def __init__(self, project):
+        url = "https://scratch.mit.edu/projects/{}".format(project["id"])
+        embed_url = "https://scratch.mit.edu/projects/{}/embed/".format(
+            project["id"]
+        )
+        self.__dict__.update(
+            projectid=project["id"], title=project["title"],
+            description=project["description"],
+            instructions=project["instructions"],
+            visibility=project["visibility"], public=project["public"],
+            comment_open=project["comments_allowed"],
+            image=project["image"],
+            created=project["history"]["created"],
+            modified=project["history"]["modified"],
+            shared=project["history"]["shared"],
+            views=project["stats"]["views"],
+            loves=project["stats"]["loves"],
+            favorites=project["stats"]["favorites"],
+            comment_counts=project["stats"]["comments"],
+            remix_count=project["stats"]["remixes"],
+            author=_DictUser(project["author"]), parent=None, root=None,
+            notes=project["description"], credits=project["description"],
+            url=url, remixes_url=url + "/remixes",
+            studios_url=url + "/studios", see_inside_url=url + "/editor",
+            fullscreen_url=url + "/fullscreen", embed_url=embed_url,
+            embed_html="""<iframe
+    allowtransparency="true"
+    width="485"
+    height="402"
+    src="{0}?autostart=false"
+    frameborder="0"
+    allowfullscreen
+></iframe>""".format(embed_url),
+        )
+
+STUDIO = {
+    "id": 0,
+    "title": "Games",
+    "host": 1882674,
+    "description": "Add your best games!",
+    "visibility": "visible",
+    "image": "https://cdn2.scratch.mit.edu/get_image/gallery/0_170x100.png",
+    "history": {"created": "2019-01-01T00:00:00.000Z",
+                "modified": "2019-01-02T00:00:00.000Z"},
+    "stats": {"followers": 300},
+}
+
+CLASSROOM = {
+    "id": 0,
+    "title": "Period 3",
+    "date_start": "2019-01-01T00:00:00.000Z",
+    "date_end": None,
+    "images": {},
+    "status": "Making games",
+    "description": "The computer science class.",
+    "educator": PAYLOAD["author"],
+}
+
+COMMENT = {
+    "id": 0,
+    "content": "Great game!",
+    "datetime_created": "2019-01-01T00:00:00.000Z",
+    "datetime_modified": "2019-01-01T00:00:00.000Z",
+    "reply_count": 0,
+    "visibility": "visible",
+    "author": PAYLOAD["author"],
+}
+
+class _DictStudio(object):
+    """A Studio the way it was stored before: everything in __dict__."""
+
+    def __init__(self, studio):
+        self.__dict__.update(
+            studioid=studio["id"], title=studio["title"],
+            image=studio["image"], description=studio["description"],
+            visibility=studio["visibility"],
+            created=studio["history"]["created"],
+            modified=studio["history"]["modified"],
+            followers=studio["stats"]["followers"],
+            owner_id=studio["host"], author_id=studio["host"],
+        )
+
+class _DictClassroom(object):
+    """A Classroom the way it was stored before: everything in __dict__."""
+
+    def __init__(self, classroom):
+        educator = _DictUser(classroom["educator"])
+        self.__dict__.update(
+            classid=classroom["id"], title=classroom["title"],
+            start=classroom["date_start"], end=classroom["date_end"],
+            images=classroom["images"], status=classroom["status"],
+            description=classroom["description"],
+            educator=educator, teacher=educator,
+            about_class=classroom["status"], bio=classroom["description"],
+            what_were_working_on=classroom["description"],
+            what_working_on=classroom["description"],
+        )
+
+class _DictSender(object):
+    """A comment's author the way it was stored before: a User only
+    knowing its username, in __dict__.
+    """
+
+    def __init__(self, username):
+        self.__dict__.update(username=username)
+
+class _DictComment(object):
+    """A Comment the way it was stored before: everything in __dict__."""
+
+    def __init__(self, comment):
+        sender = _DictSender(comment["author"]["username"])
+        self.__dict__.update(
+            comment_id=comment["id"], sender=sender, author=sender,
+            _path="projects/104/comments/", content=comment["content"],
+            parent=None, reply_count=comment["reply_count"],
+            created=comment["datetime_created"],
+            last_modified=comment["datetime_modified"],
+            visibility=comment["visibility"],
+        )
+
+class _DictGenericData(GenericData):
+    """GenericData the way it was made before: __dict__ updated."""
+
+    def __init__(self, **kwargs): # pylint: disable=super-init-not-called
+        self.__dict__.update(kwargs)
+
+def measure(make, count):
+    """Return the bytes per object of count objects made by make(i)."""
+    tracemalloc.start()
+    objs = [make(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / count
+
+def payload(template, i, user="author"):
+    """Return template with ID i, and a user of its own under user."""
+    result = dict(template, id=i)
+    if user in template:
+        result[user] = dict(template[user], username="user{0}".format(i))
+    return result
+
+def make_classroom(data):
+    """Make a Classroom out of a payload, the way info() does."""
+    obj = Classroom(data["id"])
+    obj._load(data) # pylint: disable=protected-access
+    return obj
+
+def statistic(i):
+    """Return the fields of a GenericData like a statistics point."""
+    return {"timestamp": 1546300800.0 + i * 86400, "value": i,
+            "_repr_str": "Comments as of {0}".format(i)}
+
+def main(count=100000):
+    """Print the bytes per object of both layouts, for every model."""
+    cases = (
+        ("projects with their authors", PAYLOAD, "author",
+         _DictProject, Project.from_json),
+        ("studios", STUDIO, None, _DictStudio, Studio.from_json),
+        ("classrooms with their educators", CLASSROOM, "educator",
+         _DictClassroom, make_classroom),
+        ("comments with their authors", COMMENT, "author",
+         _DictComment, lambda comment: Comment.from_json(
+             comment, path="projects/104/comments/")),
+    )
+    for name, template, user, old, new in cases:
+        compare("{0} {1}".format(count, name),
+                [payload(template, i, user) for i in range(count)], old, new)
+    compare("{0} GenericData statistics points".format(count),
+            [statistic(i) for i in range(count)],
+            lambda point: _DictGenericData(**point),
+            lambda point: GenericData(**point), labels=("update", "setattr"))
+
+def compare(name, payloads, old, new, labels=("__dict__", "slots")):
+    """Print the bytes per object of the objects old and new make out
+    of payloads.
+    """
+    before = measure(lambda i: old(payloads[i]), len(payloads))
+    after = measure(lambda i: new(payloads[i]), len(payloads))
+    print(name)
+    print("  {0:9} {1:8.0f} bytes each".format(labels[0] + ":", before))
+    print("  {0:9} {1:8.0f} bytes each ({2:.0%})".format(labels[1] + ":",
+                                                         after, after / before))
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,209 @@
+"""
+Workflow benchmarks - how fast the usual jobs run against a MockServer.
+
+Each workload runs against a MockServer (in a process of its own, so it
+takes no memory or GIL from the library) with a fresh Transport, and
+is measured for:
+
+- requests: requests the server answered (retries included)
+- wall_time: seconds the workload took
+- p50, p99: seconds each request took, up to its response headers
+- bytes: body bytes the server sent
+- peak_memory: the most bytes the workload had allocated at once
+  (from a second run under tracemalloc, which would slow the first)
+
+The results are printed (or saved with -o) as JSON, so the numbers of
+two versions can be compared:
+
+    python benchmarks/workflows.py -o before.json
+    python benchmarks/workflows.py --compare before.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, ".")
+# pylint: disable=wrong-import-position
+import scratchapi2
+from scratchapi2 import (Project, User, FrontPage, Paginator, CommentTree,
+                         AssetStore, Transport)
+from scratchapi2.mock import MockServer
+
+class TimedTransport(Transport):
+    """A Transport remembering how long each request took."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def get(self, url, stream=False, **kwargs):
+        """GET an URL, timing it."""
+        start = time.perf_counter()
+        try:
+            return super().get(url, stream, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+def hydrate_projects(count=1000):
+    """Load the info of count projects."""
+    for project in Project.fetch_many(range(1, count + 1)):
+        project.title # pylint: disable=pointless-statement
+
+def walk_user_projects():
+    """Walk every project of a user, page by page."""
+    for project in Paginator(User("griffpatch").projects):
+        project.title # pylint: disable=pointless-statement
+
+def crawl_comments():
+    """Crawl every comment and reply of a project."""
+    CommentTree.for_project(104).crawl()
+
+def build_front_page():
+    """Download the front page and the news, and load every featured
+    project the way a page showing their details would.
+    """
+    front = FrontPage()
+    snapshot = front.refresh()
+    list(front.news(limit=10))
+    list(Project.fetch_many(project.projectid
+                            for project in snapshot.featured_projects))
+
+def download_project():
+    """Download a project's JSON and every asset it uses."""
+    root = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(root, "104.json")
+        Project(104).save_json(filename)
+        AssetStore(os.path.join(root, "assets")).fetch_project(filename)
+    finally:
+        shutil.rmtree(root)
+
+WORKLOADS = {
+    "hydrate_1000_projects": hydrate_projects,
+    "walk_user_projects": walk_user_projects,
+    "crawl_comment_tree": crawl_comments,
+    "build_front_page": build_front_page,
+    "download_project_assets": download_project,
+}
+
+def _serve(conn, kwargs):
+    """Run a MockServer, answering the commands sent through conn."""
+    with MockServer(**kwargs) as server:
+        conn.send(server.base_urls)
+        while True:
+            command = conn.recv()
+            if command == "stop":
+                return
+            conn.send((server.requests, server.bytes_sent))
+            server.clear()
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of values."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def run(workload, conn, base_urls, memory=True):
+    """Run workload and return its measurements."""
+    # Front page snapshots are kept by the singleton; start without one.
+    FrontPage()._snapshot = None # pylint: disable=protected-access
+    conn.send("clear")
+    conn.recv()
+    transport = TimedTransport(base_urls=base_urls).install()
+    start = time.perf_counter()
+    workload()
+    wall_time = time.perf_counter() - start
+    conn.send("stats")
+    requests, size = conn.recv()
+    result = {
+        "requests": requests,
+        "wall_time": round(wall_time, 4),
+        "p50": percentile(transport.latencies, 0.5),
+        "p99": percentile(transport.latencies, 0.99),
+        "bytes": size,
+        "peak_memory": None,
+    }
+    transport.close()
+    if memory:
+        FrontPage()._snapshot = None # pylint: disable=protected-access
+        transport = Transport(base_urls=base_urls).install()
+        tracemalloc.start()
+        workload()
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        transport.close()
+    return result
+
+def compare(before, after):
+    """Print how each measurement of after changed from before."""
+    for name, result in after["workloads"].items():
+        old = before["workloads"].get(name)
+        if old is None:
+            continue
+        print(name)
+        for key, value in result.items():
+            if value is None or not old.get(key):
+                continue
+            print("  {0:12} {1:>14.4f} -> {2:<14.4f} ({3:+.1%})".format(
+                key, old[key], value, value / old[key] - 1
+            ))
+
+def main():
+    """Run the benchmarks given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("workloads", nargs="*",
+                        help="workloads to run (default: all): "
+                        + ", ".join(WORKLOADS))
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="seconds the server waits before each response")
+    parser.add_argument("--listing-size", type=int, default=500,
+                        help="how long the server's listings are")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="do not measure peak memory")
+    parser.add_argument("-o", "--output", help="save the results there")
+    parser.add_argument("--compare", metavar="JSON",
+                        help="compare with the results saved there")
+    args = parser.parse_args()
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            parser.error("unknown workload: {0}".format(name))
+    conn, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, daemon=True, args=(
+        child, {"latency": args.latency, "listing_size": args.listing_size}
+    ))
+    server.start()
+    base_urls = conn.recv()
+    try:
+        results = {
+            "version": scratchapi2.__version__,
+            "python": platform.python_version(),
+            "latency": args.latency,
+            "listing_size": args.listing_size,
+            "workloads": {
+                name: run(WORKLOADS[name], conn, base_urls,
+                          memory=not args.no_memory)
+                for name in args.workloads or WORKLOADS
+            },
+        }
+    finally:
+        conn.send("stop")
+        server.join()
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fileobj:
+            fileobj.write(text + "\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fileobj:
+            compare(json.load(fileobj), results)
+    elif not args.output:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,103 @@
-"""
-Scratch API library scratchapi2
-Under GPL version 3 or any later version.
-See LICENSE
-
-Scratch is a project of the Lifelong Kindergarten Group at the MIT Media Lab
-
-Requires the requests library.
-
-This is made from these classes:
-* Misc - Generic things, Statistics, Search, Health
-* Project - Information about projects
-* User - Information about Scratch user, Followers, Messages, Favorites
-* FrontPage - Information about the front page
-* Translate - Translator
-* ScratchAPIError - Error
-* GenericData - help yourself.
-* StatisticsType - Use along with Misc.statistics()
-* Studio - Information about a studio
-* Classroom - Information about a classroom
-* Maintenance - an exception which is raised when Scratch is in Maintenance Mode.
-"""
-
-from .user import User, Project, Classroom, Studio
-from .translate import Translate
-from .front import FrontPage
-from .misc import Misc, StatisticsType
-from .excs import ScratchAPIError, Maintenance
-from .gclass import GenericData
-
-__version__ = '1.5'
-
-
-__all__ = [
-    'Translate',
-    'Project',
-    'User',
-    'Classroom',
-    'Studio',
-    'FrontPage',
-    'Misc',
-    'ScratchAPIError',
-    'GenericData',
-    'StatisticsType',
-    'Maintenance'
-]
+"""
+Scratch API library scratchapi2
+Under GPL version 3 or any later version.
+See LICENSE
+
+Scratch is a project of the Lifelong Kindergarten Group at the MIT Media Lab
+
+Requires the requests library.
+
+This is made from these classes:
+* Misc - Generic things, Statistics, Search, Health
+* Project - Information about projects
+* User - Information about Scratch user, Followers, Messages, Favorites
+* FrontPage - Information about the front page
+* Translate - Translator
+* TranslationMemo - remembers translations for Translate, optionally on disk.
+* ScratchAPIError - Error
+* GenericData - help yourself.
+* StatisticsType - Use along with Misc.statistics()
+* Studio - Information about a studio
+* Classroom - Information about a classroom
+* Maintenance - an exception which is raised when Scratch is in Maintenance Mode.
+* FetchError - yielded by fetch_many() in place of objects that failed to load.
+* Transport - the pooled HTTP connection every request goes through.
+* Cache, SQLiteBackend - response cache to give to Transport.
+* RateLimiter, RetryPolicy - throttling and retries to give to Transport.
+* RateLimited - an exception which is raised when the API keeps answering 429.
+* Paginator - walks every page of a listing method.
+* Statistics, Series - the monthly statistics as compact time series.
+* CommentTree - every comment and reply of a project, studio or profile.
+* RemixTree - walks the remixes of a project, their remixes, and so on.
+* AssetStore - downloads assets concurrently into a local, content-addressed store.
+* IdentityMap - keeps one object per project, user, studio or classroom.
+* Instruments, Metrics - hooks around every request, and per-endpoint counters.
+* Watcher - polls many users, projects and studios for new projects, comments and additions.
+* Exporter - streams crawl results to NDJSON or CSV files, optionally gzipped.
+* FollowGraph - crawls who follows whom, writing the edges to a file, with checkpoints.
+
+scratchapi2.download has resumable downloads and scan_project(), which
+reads the targets, assets and block counts of a project's JSON.
+
+scratchapi2.mock has MockServer, a local stand-in for the Scratch
+servers, for tests and benchmarks.
+
+The same classes for asyncio are in scratchapi2.aio (requires aiohttp).
+"""
+
+from .user import User, Project, Classroom, Studio
+from .translate import Translate, TranslationMemo
+from .front import FrontPage
+from .misc import Misc, StatisticsType
+from .excs import ScratchAPIError, Maintenance, FetchError, RateLimited
+from .gclass import GenericData
+from .transport import Transport
+from .cache import Cache, SQLiteBackend
+from .ratelimit import RateLimiter, RetryPolicy
+from .paginate import Paginator
+from .stats import Statistics, Series
+from .comments import CommentTree
+from .identity import IdentityMap
+from .remixes import RemixTree
+from .assets import AssetStore
+from .instrument import Instruments, Metrics
+from .watch import Watcher
+from .export import Exporter
+from .social import FollowGraph
+
+__version__ = '1.5'
+
+
+__all__ = [
+    'Translate',
+    'TranslationMemo',
+    'Project',
+    'User',
+    'Classroom',
+    'Studio',
+    'FrontPage',
+    'Misc',
+    'ScratchAPIError',
+    'GenericData',
+    'StatisticsType',
+    'Maintenance',
+    'FetchError',
+    'Transport',
+    'Cache',
+    'SQLiteBackend',
+    'RateLimiter',
+    'RetryPolicy',
+    'RateLimited',
+    'Paginator',
+    'Statistics',
+    'Series',
+    'CommentTree',
+    'IdentityMap',
+    'RemixTree',
+    'AssetStore',
+    'Instruments',
+    'Metrics',
+    'Watcher',
+    'Exporter',
+    'FollowGraph'
+]
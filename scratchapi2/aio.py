@@ -0,0 +1,796 @@
+"""
+Scratch API for asyncio
+
+The same models as scratchapi2, but every request is awaited instead of
+blocking, so thousands of lookups can be in flight on one event loop.
+Nothing is fetched when an object is made, and reading an attribute
+that is not loaded yet raises AttributeError; await info() to load it.
+Methods that yield several objects are async generators:
+
+    project = Project(104)
+    await project.info()
+    async for comment in project.comments():
+        ...
+
+Requires the aiohttp library (pip install scratchapi2[async]).
+
+Contains classes:
+* AsyncTransport
+* Project
+* User
+* Studio
+* Classroom
+* Comment
+* Misc
+* FrontPage
+* Translate
+* AsyncPaginator
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from urllib.parse import quote as urlencode, urlsplit
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+from . import user as _user
+from .api import APIClass, APISingleton
+from .excs import ScratchAPIError, Maintenance, RateLimited, FetchError
+from .gclass import GenericData
+from .misc import Misc as _Misc
+from .translate import Translate as _Translate
+from .front import _sections
+from .paginate import Paginator
+from .identity import IdentityMap
+from .transport import rewrite_url
+from .instrument import Instruments, RequestEvent
+from .coalesce import AsyncSingleFlight
+from .jsondecode import get_decoder
+
+#pylint: disable=invalid-overridden-method,arguments-differ,unused-argument,protected-access
+#pylint: disable=too-many-instance-attributes
+
+class AsyncTransport(object):
+    """A pooled, non-blocking HTTP transport shared by every async call.
+
+    pool_size is the number of requests in flight per host.
+    host_pool_sizes overrides it for some hosts.
+    limiter (a RateLimiter) and retry (a RetryPolicy) work as they do
+    for Transport; waiting for them does not block the event loop.
+    base_urls, instruments, coalesce and decoder too; an Instruments can
+    be shared by both kinds of transport.
+
+    The session and the per-host semaphores belong to the event loop
+    they were made in, and are made anew when another loop uses the
+    transport (each asyncio.run(), for instance). asyncio.run() closes
+    the session before it closes its loop; else await close().
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, pool_size=100, host_pool_sizes=None, timeout=30,
+                 limiter=None, retry=None, base_urls=None, instruments=None,
+                 coalesce=True, decoder=None):
+        """Initialize the transport. The session is made on first use."""
+        if aiohttp is None:
+            raise ImportError("scratchapi2.aio requires the aiohttp library.")
+        self.pool_size = pool_size
+        self.host_pool_sizes = dict(host_pool_sizes or {})
+        self.timeout = timeout
+        self.limiter = limiter
+        self.retry = retry
+        self.base_urls = dict(base_urls or {})
+        self.loads = get_decoder(decoder)
+        self.instruments = instruments or Instruments()
+        self.coalesce = coalesce
+        self.flights = AsyncSingleFlight()
+        self._session = None
+        self._closer = None
+        self._loop = None
+        self._semaphores = {}
+        self.identities = IdentityMap()
+
+    def __repr__(self):
+        """Represent the transport."""
+        return "<AsyncTransport pool_size={0}>".format(self.pool_size)
+
+    __str__ = __repr__
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _open(self):
+        """Return the aiohttp session of the running event loop, making
+        it (and the semaphores) if they were made in another one.
+        """
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            # What the old loop made cannot be used, or closed, in this one.
+            self._loop = loop
+            self._session = None
+            self._semaphores = {}
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0, limit_per_host=0),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._closer = _closing(self._session)
+            await self._closer.__anext__() # pylint: disable=unnecessary-dunder-call
+        return self._session
+
+    def _semaphore(self, url):
+        """Return the semaphore bounding requests to url's host."""
+        host = urlsplit(url).hostname
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(
+                self.host_pool_sizes.get(host, self.pool_size)
+            )
+        return self._semaphores[host]
+
+    async def _instrumented(self, url, endpoint, func):
+        """Return await func(event), calling the hooks of instruments
+        around it.
+        """
+        event = RequestEvent(endpoint=endpoint or url, url=url)
+        for hook in self.instruments.before:
+            hook(event)
+        start = time.perf_counter()
+        try:
+            return await func(event)
+        except Exception as exc:
+            event.error = exc
+            raise
+        finally:
+            if event.latency is None:
+                event.latency = time.perf_counter() - start
+            for hook in self.instruments.after:
+                hook(event)
+
+    async def get_json(self, url, endpoint=None):
+        """GET an URL and return its parsed JSON. Concurrent calls for the
+        same URL share one request, unless coalesce is false. endpoint is
+        the path template of url, for the hooks of instruments.
+        """
+        url = rewrite_url(url, self.base_urls)
+        if not self.coalesce:
+            return await self._get_json(url, endpoint)
+        return await self.flights.do(url, lambda: self._get_json(url, endpoint))
+
+    async def _get_json(self, url, endpoint):
+        if self.instruments.active:
+            return await self._instrumented(
+                url, endpoint, lambda event: self._send_json(url, event)
+            )
+        return await self._send_json(url)
+
+    async def _send_json(self, url, event=None):
+        """GET an URL, waiting for the limiter and retrying as the retry
+        policy says, and return its parsed JSON. The status, bytes and
+        retries are set on event.
+        """
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                await asyncio.sleep(self.limiter.reserve(url))
+            try:
+                session = await self._open()
+                async with self._semaphore(url):
+                    async with session.get(url) as resp:
+                        if (self.retry is None or not self.retry.should_retry(
+                                attempt, resp.status)):
+                            if event is not None:
+                                event.status = resp.status
+                            if resp.status >= 500:
+                                raise Maintenance
+                            if resp.status == 429:
+                                raise RateLimited(url)
+                            body = await resp.read()
+                            if event is not None:
+                                event.bytes = len(body)
+                            return self.loads(body)
+                        status = resp.status
+                        retry_after = resp.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if self.retry is None or not self.retry.should_retry(attempt):
+                    raise
+                status, retry_after = None, None
+            wait = self.retry.delay(attempt, retry_after)
+            if self.limiter is not None and status == 429:
+                self.limiter.pause(url, wait)
+            else:
+                await asyncio.sleep(wait)
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+
+    async def save(self, url, fileobj, chunk_size=65536, endpoint=None):
+        """GET an URL and copy its body into the file object fileobj.
+        endpoint is given to the hooks of instruments.
+        """
+        url = rewrite_url(url, self.base_urls)
+        if self.instruments.active:
+            return await self._instrumented(
+                url, endpoint,
+                lambda event: self._save(url, fileobj, chunk_size, event)
+            )
+        return await self._save(url, fileobj, chunk_size)
+
+    async def _save(self, url, fileobj, chunk_size, event=None):
+        start = time.perf_counter()
+        written = 0
+        session = await self._open()
+        async with self._semaphore(url):
+            async with session.get(url) as resp:
+                if event is not None:
+                    # As for Transport, up to the headers only.
+                    event.latency = time.perf_counter() - start
+                    event.status = resp.status
+                async for block in resp.content.iter_chunked(chunk_size):
+                    fileobj.write(block)
+                    written += len(block)
+        if event is not None:
+            event.bytes = written
+        return written
+
+    async def close(self):
+        """Close every pooled connection. The transport can still be
+        used: a new session is made.
+        """
+        if self._closer is not None:
+            closer, self._closer = self._closer, None
+            await closer.aclose()
+        self._session = None
+
+    # For contextlib.aclosing() and the like.
+    aclose = close
+
+    def install(self):
+        """Make this transport the one used by every async call."""
+        with AsyncTransport._default_lock:
+            AsyncTransport._default = self
+        return self
+
+    @classmethod
+    def default(cls):
+        """Return the shared transport, creating it if needed."""
+        if AsyncTransport._default is None:
+            with AsyncTransport._default_lock:
+                if AsyncTransport._default is None:
+                    AsyncTransport._default = cls()
+        return AsyncTransport._default
+
+async def _closing(session):
+    """Close session when closed. Left suspended, an async generator is
+    closed by the loop's shutdown_asyncgens(), which asyncio.run() awaits
+    before closing the loop.
+    """
+    try:
+        yield
+    finally:
+        await session.close()
+
+async def _request(path, *opts, api_url="https://api.scratch.mit.edu/"):
+    result = await AsyncTransport.default().get_json(
+        api_url + path.format(*opts), endpoint=path.split("?", 1)[0]
+    )
+    if isinstance(result, dict) and 'code' in result:
+        raise ScratchAPIError(result['code'] + ': ' + result['message'])
+    return result
+
+class _AsyncModel(object):
+    """Base class for the async models."""
+
+    __slots__ = ()
+    _autoload = False
+
+    @staticmethod
+    def _identities():
+        return AsyncTransport.default().identities
+
+    @classmethod
+    async def fetch_many(cls, keys, workers=100):
+        """Load an object for every key (ID or username) in keys, with up
+        to workers info() requests in flight. Yields them in the order of
+        keys. If one fails, a FetchError is yielded in its place and the
+        rest are still loaded.
+        """
+        async for obj in _fetch_many(cls, keys, workers):
+            yield obj
+
+async def _fetch_many(cls, keys, workers):
+    """Make a cls for every key and await info() on it, up to workers at
+    once, yielding them (or a FetchError) in order.
+    """
+    async def load(key):
+        obj = key
+        try:
+            obj = cls(key)
+            await obj.info()
+        except Exception as exc: # pylint: disable=broad-except
+            return FetchError(obj, exc)
+        return obj
+    pending = deque()
+    try:
+        for key in keys:
+            pending.append(asyncio.ensure_future(load(key)))
+            if len(pending) >= workers:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+class Project(_AsyncModel, _user.Project):
+    """Represents a Scratch Project."""
+
+    __slots__ = ()
+
+    def __init__(self, projectid, getinfo=False):
+        """Initialize a Project. Await info() to load it."""
+        super().__init__(projectid, getinfo=False)
+
+    async def info(self):
+        """Get information about a project. It sets its fields and returns them."""
+        self._load(await _request('projects/{0}', self.projectid))
+        self._loaded = True
+        return self._as_dict()
+
+    async def remixes(self, limit=3, offset=0):
+        """Yield all remixes of this Project."""
+        req = await _request("projects/{0}/remixes?limit={1}&offset={2}",
+                             self.projectid, limit, offset)
+        for remix in req:
+            yield Project.from_json(remix)
+
+    async def ancestors(self):
+        """Yield the parent of this Project, then its parent, and so on
+        up to the project everything was remixed from.
+        """
+        project = self
+        while True:
+            try:
+                project = project.parent
+            except AttributeError:
+                await project.info()
+                project = project.parent
+            if project is None:
+                return
+            yield project
+
+    async def studios(self, limit=3, offset=0):
+        """Yield all studios this Project belongs to."""
+        req = await _request('projects/{0}/studios?limit={1}&offset={2}',
+                             self.projectid, limit, offset)
+        for studio in req:
+            yield Studio.from_json(studio)
+
+    async def save_json(self, filename_or_obj):
+        """Save a project's JSON to a file."""
+        if isinstance(filename_or_obj, str):
+            filename_or_obj = open(filename_or_obj, 'wb')
+        with filename_or_obj:
+            await AsyncTransport.default().save(
+                "https://projects.scratch.mit.edu/{}".format(self.projectid),
+                filename_or_obj, endpoint="{0}"
+            )
+
+    async def comments(self, limit=10, offset=0):
+        """ Get comments. Note that replies are not included here. """
+        req = await _request('projects/{0}/comments?limit={1}&offset={2}',
+                             self.projectid, limit, offset)
+        for comment in req:
+            yield Comment.from_json(
+                comment,
+                path="projects/{0}/comments/".format(self.projectid)
+            )
+
+    async def comment(self, comment_id):
+        """ Get a specific comment of a project, by using ID. """
+        chain = []
+        while comment_id:
+            chain.append(await _request('projects/{0}/comments/{1}',
+                                        self.projectid, comment_id))
+            comment_id = chain[-1]["parent_id"]
+        comment = None
+        for item in reversed(chain):
+            comment = Comment.from_json(
+                item,
+                path="projects/{0}/comments/".format(self.projectid),
+                parent=comment
+            )
+        return comment
+
+class User(_AsyncModel, _user.User):
+    """Represents a Scratch user."""
+
+    __slots__ = ()
+
+    def __init__(self, username, getinfo=False):
+        """Initialize a User. Await info() to load it."""
+        super().__init__(username, getinfo=False)
+
+    async def info(self):
+        """Get information about an user. It sets its fields and returns them."""
+        self._load(await _request('users/{0}', self.username))
+        self._loaded = True
+        return self._as_dict()
+
+    async def following(self, limit=100, offset=0):
+        """Yield other Users this User follows."""
+        req = await _request("users/{0}/following?limit={1}&offset={2}",
+                             self.username, limit, offset)
+        for user in req:
+            yield User.from_json(user)
+
+    async def followers(self, limit=100, offset=0):
+        """Yield other Users that follow this User."""
+        req = await _request("users/{0}/followers?limit={1}&offset={2}",
+                             self.username, limit, offset)
+        for user in req:
+            yield User.from_json(user)
+
+    async def unread_messages(self):
+        """Return the number of messages this User has not read."""
+        req = await _request("users/{0}/messages/count", self.username)
+        return req["count"]
+
+    async def projects(self, limit=10, offset=0):
+        """Yield the user's Projects."""
+        req = await _request("users/{0}/projects?limit={1}&offset={2}",
+                             self.username, limit, offset)
+        for project in req:
+            yield Project.from_json(project)
+
+    async def favorites(self, limit=10, offset=0):
+        """Yield the user's favorite Projects."""
+        req = await _request("users/{0}/favorites?limit={1}&offset={2}",
+                             self.username, limit, offset)
+        for project in req:
+            yield Project.from_json(project)
+
+    async def curating(self, limit=10, offset=0):
+        """ Yield what studios the user is curating. """
+        req = await _request("users/{0}/studios/curate?limit={1}&offset={2}",
+                             self.username, limit, offset)
+        for studio in req:
+            yield Studio.from_json(studio)
+
+class Classroom(_AsyncModel, _user.Classroom):
+    """Represents a Scratch Classroom."""
+
+    __slots__ = ()
+
+    def __init__(self, classid, getinfo=False):
+        """Initialize a Classroom. Await info() to load it."""
+        super().__init__(classid, getinfo=False)
+
+    async def info(self):
+        """Get an information about a classroom. It sets its fields
+        and returns them.
+        """
+        self._load(await _request("classrooms/{0}", self.classid))
+        self._loaded = True
+        return self._as_dict()
+
+class Comment(_user.Comment):
+    """ A comment. """
+
+    __slots__ = ()
+
+    async def replies(self, limit=3, offset=0):
+        """ Get replies. """
+        if not self.has_reply:
+            return
+        replies = await _request("{0}{1}/replies?limit={2}&offset={3}",
+                                 self._path,
+                                 self.comment_id,
+                                 limit,
+                                 offset)
+        for reply in replies:
+            yield self.from_json(reply, path=self._path, parent=self)
+
+class Studio(_AsyncModel, _user.Studio):
+    """Represents a studio. """
+
+    __slots__ = ()
+
+    def __init__(self, studioid, getinfo=False):
+        """Initialize a Studio. Await info() to load it."""
+        super().__init__(studioid, getinfo=False)
+
+    async def info(self):
+        """Get an information about a studio. It sets its fields
+        and returns them.
+        """
+        self._load(await _request("studios/{0}", self.studioid))
+        self._loaded = True
+        return self._as_dict()
+
+    async def projects(self, limit=5, offset=0):
+        """Gets list of projects in a studio."""
+        req = await _request("studios/{0}/projects?limit={1}&offset={2}",
+                             self.studioid, limit, offset)
+        for project in req:
+            yield Project.from_json(_user._studio_project(project))
+
+Project._user_class = User
+Project._project_class = Project
+Project._comment_class = Comment
+Classroom._user_class = User
+Comment._user_class = User
+
+class AsyncAPIClass(APIClass):
+    """Base class for classes that access the API asynchronously."""
+
+    async def _request(self, path, *opts, api_url=None):
+        """Internal method to request data from the API."""
+        return await AsyncTransport.default().get_json(
+            (api_url or self.api_url)
+            + path.format(*opts),
+            endpoint=path.split("?", 1)[0]
+        )
+
+class AsyncAPISingleton(AsyncAPIClass, APISingleton):
+    """Base class for singleton classes that access the API asynchronously."""
+
+class Misc(AsyncAPISingleton):
+    """Misc - Generic things."""
+
+    async def info(self):
+        """Get meta information."""
+        return GenericData(**await self._request(""))
+
+    async def health(self):
+        """Get health information."""
+        return _Misc._parse_health(await self._request("health"))
+
+    async def project_count(self):
+        """Count all shared projects."""
+        return (await self._request('projects/count/all'))['count']
+
+    async def statistics(self, statistics_type=None, **kwargs):
+        """Get statistics. See scratchapi2.Misc.statistics() for detail."""
+        if not statistics_type:
+            return _Misc._parse_statistics(
+                await self._request('statistics/data/daily/',
+                                    api_url='https://scratch.mit.edu/')
+            )
+        return _Misc._parse_statistics(
+            await self._request('statistics/data/monthly/',
+                                api_url='https://scratch.mit.edu/'),
+            statistics_type,
+            **kwargs
+        )
+
+    async def search_projects(self, key=None, limit=10):
+        """Search Projects."""
+        results = await self._request('search/projects?limit={}{}',
+                                      limit,
+                                      ('&q={}'.format(urlencode(key))
+                                       if key
+                                       else ''))
+        for result in results:
+            yield Project.from_json(result)
+
+    def popular_projects(self, limit=10):
+        """Return popular projects."""
+        return self.search_projects(limit=limit)
+
+    async def search_studios(self, key, limit=10):
+        """Search Studios."""
+        results = await self._request('search/studios?limit={}&q={}',
+                                      limit,
+                                      key)
+        for result in results:
+            yield Studio.from_json(result)
+
+    async def username_available(self, name):
+        """Check if a username is available."""
+        result = await self._request('accounts/check_username/{}',
+                                     name,
+                                     api_url='https://scratch.mit.edu/')
+        return result[0]["msg"]
+
+    async def valid_email(self, email):
+        """Check if an email address is valid."""
+        result = await self._request('accounts/check_email/{}',
+                                     email,
+                                     api_url='https://scratch.mit.edu/')
+        return result[0]["msg"]
+
+class FrontPage(AsyncAPISingleton):
+    """The Front Page of the Scratch website."""
+
+    ttl = 300
+    _snapshot = None
+    _snapshot_lock = None
+    _snapshot_loop = None
+
+    async def news(self, limit=3, offset=0):
+        """Get Scratch news."""
+        result = await self._request('news?limit={0}&offset={1}', limit, offset)
+        class News(GenericData):
+            """Represents a news item."""
+            _repr_str = '<News {newsid}>'
+            newsid = None
+        for item in result:
+            yield News(
+                newsid=item["id"],
+                timestamp=item["stamp"],
+                title=item["headline"],
+                url=item["url"],
+                image=item["image"],
+                description=item["copy"]
+            )
+
+    async def snapshot(self, max_age=None):
+        """Return every section of the front page. See
+        scratchapi2.FrontPage.snapshot() for detail.
+        """
+        if max_age is None:
+            max_age = self.ttl
+        loop = asyncio.get_event_loop()
+        if self._snapshot_loop is not loop:
+            # A lock cannot be shared by two event loops.
+            self._snapshot_loop = loop
+            self._snapshot_lock = asyncio.Lock()
+        async with self._snapshot_lock:
+            if (self._snapshot is None
+                    or time.time() - self._snapshot.timestamp >= max_age):
+                self._snapshot = _sections(
+                    await self._request('proxy/featured'),
+                    project_class=Project,
+                    studio_class=Studio,
+                    user_class=User
+                )
+            return self._snapshot
+
+    async def refresh(self):
+        """Download the front page again now, and return the snapshot."""
+        return await self.snapshot(max_age=0)
+
+    async def featured_projects(self):
+        """Get featured Projects."""
+        for project in (await self.snapshot()).featured_projects:
+            yield project
+
+    async def most_remixed_projects(self):
+        """Get most remixed Projects."""
+        for project in (await self.snapshot()).most_remixed_projects:
+            yield project
+
+    async def most_loved_projects(self):
+        """Get most loved Projects."""
+        for project in (await self.snapshot()).most_loved_projects:
+            yield project
+
+    async def curated_projects(self):
+        """Get the currently curated Projects and the current curator."""
+        for item in (await self.snapshot()).curated_projects:
+            yield item
+
+    async def sds_projects(self):
+        """Get SDS Projects."""
+        for item in (await self.snapshot()).sds_projects:
+            yield item
+
+    async def featured_studios(self):
+        """Get featured Studios."""
+        for studio in (await self.snapshot()).featured_studios:
+            yield studio
+
+class Translate(AsyncAPISingleton, _Translate):
+    """Represents the Translate API."""
+
+    async def translate_status(self):
+        """Check the status of the API."""
+        try:
+            req = await self._request("")
+            return req["ok"]
+        except KeyError:
+            return False
+
+    async def languages(self, locale="en"):
+        """Return available langauges. They are only requested once for
+        each locale.
+        """
+        if locale not in self._languages:
+            self._languages[locale] = await self._request(
+                'supported?language={}', locale
+            )
+        return self._languages[locale]
+
+    async def translate(self, locale="ja", text="Hello"):
+        """Translate text."""
+        result = self.memo.get(locale, text)
+        if result is None:
+            result = (await self._request('translate?language={0}&text={1}',
+                                          locale, urlencode(text)))['result']
+            self.memo.set(locale, text, result)
+        return result
+
+    async def translate_many(self, pairs, workers=100):
+        """Translate every (locale, text) pair of pairs, up to workers at
+        once, and return the translations as a dict keyed by the pairs.
+        Only the pairs not in the memo are requested. If one fails, a
+        FetchError is put in its place and the rest are still translated.
+        """
+        results = {}
+        missing = []
+        for pair in pairs:
+            if pair in results:
+                continue
+            results[pair] = self.memo.get(*pair)
+            if results[pair] is None:
+                missing.append(pair)
+        semaphore = asyncio.Semaphore(workers)
+        async def translate(pair):
+            async with semaphore:
+                try:
+                    return await self.translate(*pair)
+                except Exception as exc: # pylint: disable=broad-except
+                    return FetchError(pair, exc)
+        for pair, result in zip(missing, await asyncio.gather(
+                *(translate(pair) for pair in missing))):
+            results[pair] = result
+        return results
+
+class AsyncPaginator(Paginator):
+    """Iterate every item of an async listing method, page by page.
+    See scratchapi2.Paginator; use it with async for.
+    """
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._page:
+            if self._done:
+                raise StopAsyncIteration
+            await self._advance()
+        self.offset += 1
+        return self._page.popleft()
+
+    async def _fetch(self, offset):
+        """Request one page."""
+        return [item async for item in self.method(limit=self.page_size,
+                                                   offset=offset,
+                                                   **self.kwargs)]
+
+    async def _advance(self):
+        """Take the next page, and start requesting the one after it."""
+        if self._future is not None:
+            future, self._future = self._future, None
+            page = await future
+        else:
+            page = await self._fetch(self._next_offset)
+        self._next_offset += len(page)
+        if len(page) < self.page_size:
+            self._done = True
+        elif self.prefetch:
+            self._future = asyncio.ensure_future(
+                self._fetch(self._next_offset)
+            )
+        self._page.extend(page)
+
+    async def pages(self):
+        """Yield the remaining items a page (list) at a time."""
+        while True:
+            if self._page:
+                page = list(self._page)
+                self._page.clear()
+            elif self._done:
+                return
+            else:
+                await self._advance()
+                continue
+            self.offset += len(page)
+            yield page
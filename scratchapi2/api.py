@@ -1,6 +1,6 @@
 """Contains the APIClass and APISingleton base classes."""
-import requests
-from .excs import Maintenance
+from .excs import Maintenance, RateLimited
+from .transport import Transport
 
 class APIClass(object):
     """Base class for classes that access the API."""
@@ -17,22 +17,26 @@ class APIClass(object):
 
     def _request(self, path, *opts, api_url=None):
         """Internal method to request data from the API."""
-        req = requests.get(
+        req, result = Transport.default().get_json(
             (api_url or self.api_url)
-            + path.format(*opts)
+            + path.format(*opts),
+            endpoint=path.split("?", 1)[0]
         )
         if req.status_code >= 500:
             raise Maintenance
-        else:
-            return req.json()
+        if req.status_code == 429:
+            raise RateLimited(req.url)
+        return result
 
 class APISingleton(APIClass):
     """Base class for singleton classes that access the API."""
 
     _instance = None
 
-    def __new__(cls, *args, **kwargs):
-        """Enforce this class as a singleton."""
-        if not cls._instance:
-            cls._instance = super().__new__(cls, *args, **kwargs)
+    def __new__(cls, *args, **kwargs): # pylint: disable=unused-argument
+        """Enforce this class as a singleton. (Subclasses, like the
+        ones in scratchapi2.aio, have an instance of their own.)
+        """
+        if cls.__dict__.get("_instance") is None:
+            cls._instance = super().__new__(cls)
         return cls._instance
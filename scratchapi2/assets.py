@@ -0,0 +1,136 @@
+"""
+AssetStore - a local, content-addressed copy of Scratch assets.
+
+Assets are named by their MD5 (like "<md5>.svg"), so an asset shared by
+many projects is downloaded once. They are kept as
+root/<first two letters>/<md5>.<ext>:
+
+    store = AssetStore("assets")
+    Project(104).save_json("104.json")
+    report = store.fetch_project("104.json")
+    report.downloaded, report.skipped, report.bytes
+
+Downloads run concurrently, and each asset's MD5 is checked while it
+is written; an asset that does not match is not kept.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from .download import CHUNK_SIZE, stream, scan_project
+from .excs import ScratchAPIError, FetchError
+from .gclass import GenericData
+
+_MD5EXT = re.compile(r"^([0-9a-f]{32})\.\w+$")
+
+class _HashingFile(object):
+    """Writes to fileobj, computing the MD5 of what is written."""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.md5 = hashlib.md5()
+
+    def write(self, block):
+        """Write block."""
+        self.md5.update(block)
+        return self.fileobj.write(block)
+
+class AssetStore(object):
+    """Assets kept under the directory root. workers is how many are
+    downloaded at once.
+    """
+
+    def __init__(self, root, workers=8, chunk_size=CHUNK_SIZE,
+                 api_url="https://cdn.assets.scratch.mit.edu/internalapi/"):
+        """Initialize the store, making root if needed."""
+        self.root = root
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.api_url = api_url
+        os.makedirs(root, exist_ok=True)
+
+    def __repr__(self):
+        """Represent the store."""
+        return "<AssetStore {0}>".format(self.root)
+
+    __str__ = __repr__
+
+    def __contains__(self, name):
+        return os.path.exists(self.path(name))
+
+    def path(self, name):
+        """Return where the asset name ("<md5>.<ext>") is kept."""
+        return os.path.join(self.root, name[:2], name)
+
+    def _download(self, name):
+        """Download one asset, returning its size or a FetchError."""
+        match = _MD5EXT.match(name)
+        if match is None:
+            return FetchError(name, ValueError("Not an <md5>.<ext> name"))
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fileobj = tempfile.NamedTemporaryFile(dir=os.path.dirname(path),
+                                              suffix=".part", delete=False)
+        try:
+            with fileobj:
+                hashing = _HashingFile(fileobj)
+                _, size = stream(
+                    "{0}asset/{1}/get/".format(self.api_url, name),
+                    hashing, self.chunk_size, endpoint="asset/{0}/get/"
+                )
+            if hashing.md5.hexdigest() != match.group(1):
+                raise ScratchAPIError("MD5 mismatch: got {0}".format(
+                    hashing.md5.hexdigest()
+                ))
+            os.replace(fileobj.name, path)
+        except Exception as exc: # pylint: disable=broad-except
+            os.remove(fileobj.name)
+            return FetchError(name, exc)
+        return size
+
+    def fetch(self, names):
+        """Download every asset of names (like "<md5>.svg") the store
+        does not have yet. Returns a report: downloaded (how many),
+        skipped (already in the store, or listed twice), failed (a list
+        of FetchError) and bytes (downloaded).
+        """
+        wanted = []
+        seen = set()
+        skipped = 0
+        for name in names:
+            if name in seen or name in self:
+                skipped += 1
+            else:
+                wanted.append(name)
+            seen.add(name)
+        downloaded = size = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for result in pool.map(self._download, wanted):
+                if isinstance(result, FetchError):
+                    failed.append(result)
+                else:
+                    downloaded += 1
+                    size += result
+        return GenericData(
+            downloaded=downloaded,
+            skipped=skipped,
+            failed=failed,
+            bytes=size,
+            _repr_str="<AssetReport downloaded={downloaded} skipped={skipped}>"
+        )
+
+    def fetch_project(self, source):
+        """Download every asset of a project. source is its JSON, as a
+        filename, a binary file object or the parsed dict.
+        """
+        if isinstance(source, dict):
+            names = [asset.get("md5ext") or "{0}.{1}".format(
+                asset.get("assetId"), asset.get("dataFormat")
+            ) for target in source.get("targets", ())
+                     for asset in (target.get("costumes", [])
+                                   + target.get("sounds", []))]
+        else:
+            names = scan_project(source).assets
+        return self.fetch(names)
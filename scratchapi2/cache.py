@@ -0,0 +1,219 @@
+"""
+Cache - keeps API responses so the same URL is not downloaded again.
+
+Use it by giving it to a Transport:
+    Transport(cache=Cache(ttl=60)).install()
+
+class Cache
+- get()
+- invalidate()
+- clear()
+- stats()
+class SQLiteBackend (optional, keeps responses across restarts)
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+import requests
+from requests.structures import CaseInsensitiveDict
+from .gclass import GenericData
+
+# The headers worth keeping: the validators and what .json() needs.
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+#pylint: disable=too-many-instance-attributes
+
+CacheEntry = namedtuple("CacheEntry", "body headers expires")
+
+class SQLiteBackend(object):
+    """Keeps cached responses in an SQLite database file."""
+
+    def __init__(self, path):
+        """Open (or create) the database at path."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, body BLOB, headers TEXT, expires REAL)"
+            )
+
+    def __repr__(self):
+        """Represent the backend."""
+        return "<SQLiteBackend {0}>".format(self.path)
+
+    __str__ = __repr__
+
+    def get(self, url):
+        """Return the entry for url, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, headers, expires FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(bytes(row[0]), json.loads(row[1]), row[2])
+
+    def set(self, url, entry):
+        """Store the entry for url."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (url, entry.body, json.dumps(entry.headers), entry.expires)
+            )
+
+    def delete(self, url):
+        """Forget url."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+
+    def clear(self):
+        """Forget everything."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+class Cache(object):
+    """A response cache with a bounded in-memory LRU.
+
+    ttl is how long (seconds) a response is fresh. rules overrides it
+    for some endpoints: a sequence of (regex, ttl) pairs searched in the
+    URL, the first match wins. A ttl of 0 means not cached.
+    backend (like SQLiteBackend) is asked when the LRU misses.
+
+    Responses past their ttl are kept, and revalidated with If-None-Match
+    or If-Modified-Since if the server sent an ETag or Last-Modified.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, rules=(), backend=None):
+        """Initialize an empty cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.rules = [(re.compile(pattern), rule_ttl)
+                      for pattern, rule_ttl in rules]
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Represent the cache."""
+        return "<Cache {0}/{1}>".format(len(self._entries), self.maxsize)
+
+    __str__ = __repr__
+
+    def ttl_for(self, url):
+        """Return how long the response of url stays fresh."""
+        for pattern, rule_ttl in self.rules:
+            if pattern.search(url):
+                return rule_ttl
+        return self.ttl
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _lookup(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+        if self.backend is not None:
+            entry = self.backend.get(url)
+            if entry is not None:
+                self._remember(url, entry)
+        return entry
+
+    def _remember(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _store(self, url, entry):
+        self._remember(url, entry)
+        if self.backend is not None:
+            self.backend.set(url, entry)
+
+    def get(self, url, send):
+        """Return the response of url, from the cache if it is fresh.
+        Otherwise send(headers) is called to request it, with the
+        validators of the stale entry as headers.
+        """
+        ttl = self.ttl_for(url)
+        if not ttl:
+            return send({})
+        entry = self._lookup(url)
+        if entry is not None and entry.expires > time.time():
+            self._count("hits")
+            return _response(url, entry)
+        headers = {}
+        if entry is not None:
+            if "ETag" in entry.headers:
+                headers["If-None-Match"] = entry.headers["ETag"]
+            if "Last-Modified" in entry.headers:
+                headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        resp = send(headers)
+        if resp.status_code == 304 and entry is not None:
+            self._count("revalidations")
+            entry = entry._replace(expires=time.time() + ttl)
+            self._store(url, entry)
+            return _response(url, entry)
+        self._count("misses")
+        if resp.status_code == 200:
+            self._store(url, CacheEntry(
+                resp.content,
+                {key: resp.headers[key]
+                 for key in _KEPT_HEADERS
+                 if key in resp.headers},
+                time.time() + ttl
+            ))
+        return resp
+
+    def invalidate(self, url):
+        """Forget the response of url."""
+        with self._lock:
+            self._entries.pop(url, None)
+        if self.backend is not None:
+            self.backend.delete(url)
+
+    def clear(self):
+        """Forget every response."""
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        """Return the hit/miss counters."""
+        return GenericData(
+            hits=self.hits,
+            misses=self.misses,
+            revalidations=self.revalidations,
+            size=len(self._entries),
+            _repr_str="<CacheStats hits={hits} misses={misses}>"
+        )
+
+def _response(url, entry):
+    """Make a requests.Response out of a cache entry."""
+    # pylint: disable=protected-access
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.headers = CaseInsensitiveDict(entry.headers)
+    resp._content = entry.body
+    resp._content_consumed = True
+    return resp
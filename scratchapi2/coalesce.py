@@ -0,0 +1,116 @@
+"""
+Coalescing of identical lookups made at the same time.
+
+When many threads (or tasks) ask for the same URL at once, only the
+first one requests it; the others wait for that request and get its
+result too. Transport.get_json() and AsyncTransport.get_json() go
+through one of these:
+
+    Transport.default().flights.stats()     # calls, saved, in_flight
+
+class SingleFlight (threads)
+class AsyncSingleFlight (asyncio)
+"""
+import asyncio
+import threading
+from .gclass import GenericData
+
+class _Call(object):
+    """A call in flight, and what it gave."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class _Flights(object):
+    """The counters shared by both kinds."""
+
+    def __init__(self):
+        """Initialize with nothing in flight."""
+        self.calls = 0
+        self.saved = 0
+        self._calls = {}
+
+    def __repr__(self):
+        """Represent the flights."""
+        return "<{0} calls={1} saved={2}>".format(type(self).__name__,
+                                                  self.calls, self.saved)
+
+    __str__ = __repr__
+
+    def stats(self):
+        """Return calls (made), saved (callers who shared another's
+        call instead of making their own) and in_flight.
+        """
+        return GenericData(
+            calls=self.calls,
+            saved=self.saved,
+            in_flight=len(self._calls),
+            _repr_str="<FlightStats calls={calls} saved={saved}>"
+        )
+
+class SingleFlight(_Flights):
+    """Runs one call per key at a time, for threads."""
+
+    def __init__(self):
+        """Initialize with nothing in flight."""
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Return func(), unless a call for key is in flight: then wait
+        for it and return (or raise) what it gives.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.saved += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+class AsyncSingleFlight(_Flights):
+    """Runs one call per key at a time, for asyncio tasks. The call runs
+    in a task of its own, so it goes on if the task that started it is
+    cancelled. Calls made in another event loop are not shared.
+    """
+
+    def __init__(self):
+        """Initialize with nothing in flight."""
+        super().__init__()
+        self._loop = None
+
+    async def do(self, key, func):
+        """Return await func(), unless a call for key is in flight: then
+        wait for it and return (or raise) what it gives.
+        """
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._calls = {}
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.calls += 1
+        else:
+            self.saved += 1
+        return await asyncio.shield(task)
@@ -0,0 +1,124 @@
+"""
+CommentTree - every comment of a project, studio or profile.
+
+The top-level comment pages and the replies are requested concurrently,
+and the tree is built in memory. Authors are kept as Users that are not
+loaded; fetch_authors() loads them all at once when they are needed.
+
+    tree = CommentTree.for_project(104).crawl()
+    for comment in tree:            # flat, every root then its replies
+        ...
+    for root in tree.roots:         # as a tree
+        tree.replies_of(root)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from .user import Comment, User, _request
+from .paginate import MAX_PAGE_SIZE
+
+class CommentTree(object):
+    """The comments under path, like "projects/104/comments/" (the same
+    path as Comment uses). workers is how many requests run at once.
+    """
+
+    def __init__(self, path, workers=8, page_size=MAX_PAGE_SIZE):
+        """Initialize an empty tree. Call crawl() to fill it."""
+        self.path = path
+        self.workers = workers
+        self.page_size = page_size
+        self.roots = []
+        self.comments = {}
+        self._replies = {}
+
+    def __repr__(self):
+        """Represent the tree."""
+        return "<CommentTree {0} ({1} comments)>".format(self.path,
+                                                         len(self.comments))
+
+    __str__ = __repr__
+
+    def __len__(self):
+        return len(self.comments)
+
+    def __iter__(self):
+        """Yield every comment: each root, then its replies."""
+        for root in self.roots:
+            yield root
+            yield from self._replies.get(root.comment_id, ())
+
+    @classmethod
+    def for_project(cls, projectid, **kwargs):
+        """Make the tree of a project's comments."""
+        return cls("projects/{0}/comments/".format(projectid), **kwargs)
+
+    @classmethod
+    def for_studio(cls, studioid, **kwargs):
+        """Make the tree of a studio's comments."""
+        return cls("studios/{0}/comments/".format(studioid), **kwargs)
+
+    @classmethod
+    def for_user(cls, username, **kwargs):
+        """Make the tree of the comments on a user's profile."""
+        return cls("users/{0}/comments/".format(username), **kwargs)
+
+    def _page(self, path, offset):
+        return _request("{0}?limit={1}&offset={2}",
+                        path, self.page_size, offset)
+
+    def crawl(self):
+        """Request every comment and reply, and return the tree."""
+        self.roots = []
+        self.comments = {}
+        self._replies = {}
+        top = self.path.rstrip("/")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            offset = 0
+            done = False
+            while not done:
+                # Top-level pages are requested a wave of workers at once,
+                # until one of them is short.
+                offsets = range(offset, offset + self.page_size * self.workers,
+                                self.page_size)
+                for page in pool.map(lambda off: self._page(top, off), offsets):
+                    for item in page:
+                        comment = Comment.from_json(item, path=self.path)
+                        self.roots.append(comment)
+                        self.comments[comment.comment_id] = comment
+                    if len(page) < self.page_size:
+                        done = True
+                        break
+                offset = offsets[-1] + self.page_size
+            jobs = [
+                (root, pool.submit(self._page,
+                                   "{0}{1}/replies".format(self.path,
+                                                           root.comment_id),
+                                   offset))
+                for root in self.roots if root.has_reply
+                for offset in range(0, root.reply_count, self.page_size)
+            ]
+            for root, job in jobs:
+                for item in job.result():
+                    reply = Comment.from_json(item, path=self.path, parent=root)
+                    self._replies.setdefault(root.comment_id, []).append(reply)
+                    self.comments[reply.comment_id] = reply
+        return self
+
+    def replies_of(self, comment):
+        """Return the replies of a comment of the tree."""
+        return self._replies.get(comment.comment_id, [])
+
+    def authors(self):
+        """Return the usernames of everyone who commented."""
+        return {comment.sender.username for comment in self.comments.values()}
+
+    def fetch_authors(self, workers=8):
+        """Load every author with User.fetch_many(), and give every
+        comment the loaded User. Returns them by username; authors that
+        failed to load are left out.
+        """
+        users = {user.username: user
+                 for user in User.fetch_many(sorted(self.authors()), workers)
+                 if isinstance(user, User)}
+        for comment in self.comments.values():
+            if comment.sender.username in users:
+                comment.sender = users[comment.sender.username]
+        return users
@@ -0,0 +1,287 @@
+"""
+Downloads of large files (project JSON, assets), and reading project
+JSON without loading it all.
+
+download() copies an URL to a file chunk_size bytes at a time. The data
+goes to filename + ".part" first; if a download is cut, the next call
+asks the server for the rest only (an HTTP Range request, with If-Range,
+so a file changed in between is downloaded anew) and appends.
+
+parse() yields the JSON of a file as (prefix, event, value) events, the
+way ijson.parse() does (and it uses ijson if it is installed).
+scan_project() uses it to get the targets, assets and block counts of
+a project:
+
+    Project(104).save_json("104.json")
+    scan = scan_project("104.json")
+    scan.assets                     # ["<md5>.svg", "<md5>.wav", ...]
+    [(target.name, target.blocks) for target in scan.targets]
+"""
+import codecs
+import json
+import os
+import re
+try:
+    import ijson
+except ImportError:
+    ijson = None
+from .excs import ScratchAPIError, Maintenance
+from .gclass import GenericData
+from .transport import Transport
+
+# One write per megabyte, instead of one per kilobyte.
+CHUNK_SIZE = 1 << 20
+
+def _check(resp):
+    """Raise if resp is an error."""
+    if resp.status_code >= 500:
+        raise Maintenance
+    if resp.status_code >= 400:
+        raise ScratchAPIError("{0}: {1}".format(resp.status_code, resp.url))
+
+def stream(url, fileobj, chunk_size=CHUNK_SIZE, headers=None, endpoint=None):
+    """Copy url into the file object fileobj, chunk_size bytes at a
+    time. Returns the response (already read) and the bytes copied.
+    endpoint is given to Transport.get().
+    """
+    resp = Transport.default().get(url, stream=True, endpoint=endpoint,
+                                   headers=headers or {})
+    with resp:
+        _check(resp)
+        written = _copy(resp, fileobj, chunk_size)
+    return resp, written
+
+def _copy(resp, fileobj, chunk_size):
+    """Write resp's body to fileobj, and return the bytes written."""
+    written = 0
+    for block in resp.iter_content(chunk_size):
+        fileobj.write(block)
+        written += len(block)
+    return written
+
+def _validator(resp):
+    """Return what can be sent as If-Range to resume resp's body: its
+    strong ETag, else its Last-Modified, else None.
+    """
+    etag = resp.headers.get("ETag")
+    if etag is not None and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+def _total(resp):
+    """Return the full size of resp's body, as its headers tell, or
+    None if they do not.
+    """
+    if "Content-Range" in resp.headers:
+        total = resp.headers["Content-Range"].rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    if resp.status_code == 200 and "Content-Length" in resp.headers:
+        return int(resp.headers["Content-Length"])
+    return None
+
+def _resume_point(part, validator_file):
+    """Return the size of the .part file and its validator, or (0, None)
+    if there is nothing to go on from.
+    """
+    if not (os.path.exists(part) and os.path.exists(validator_file)):
+        return 0, None
+    with open(validator_file, encoding="utf-8") as fileobj:
+        validator = fileobj.read()
+    # Without a validator, a changed file cannot be told apart.
+    if not validator:
+        return 0, None
+    return os.path.getsize(part), validator
+
+def _discard(*filenames):
+    for name in filenames:
+        if os.path.exists(name):
+            os.remove(name)
+
+def download(url, filename, chunk_size=CHUNK_SIZE, resume=True,
+             endpoint=None):
+    """Save url to filename, going on from what an earlier, cut call
+    left in filename + ".part" if resume is true. Returns the number of
+    bytes downloaded by this call. endpoint is given to Transport.get().
+
+    The ETag (or Last-Modified) of the file is kept in filename +
+    ".part.validator" and sent as If-Range, so if the file changed in
+    between, the server sends it all again and the .part file is
+    started over.
+    """
+    part = filename + ".part"
+    validator_file = part + ".validator"
+    offset, validator = _resume_point(part, validator_file) if resume else (0, None)
+    # Ranges count the bytes sent, so they must be sent as they are.
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = "bytes={0}-".format(offset)
+        headers["If-Range"] = validator
+    resp = Transport.default().get(url, stream=True, endpoint=endpoint,
+                                   headers=headers)
+    written = 0
+    with resp:
+        if resp.status_code == 416:
+            # The range starts at the end: the .part file is whole, if
+            # it is as long as the file.
+            if _total(resp) != offset:
+                _discard(part, validator_file)
+                return download(url, filename, chunk_size, False, endpoint)
+        else:
+            _check(resp)
+            if (resp.status_code == 206 and not resp.headers.get(
+                    "Content-Range", "").startswith("bytes {0}-".format(offset))):
+                raise ScratchAPIError("Unexpected range: {0}".format(url))
+            total = _total(resp)
+            if resp.status_code != 206:
+                validator = _validator(resp)
+                with open(validator_file, "w", encoding="utf-8") as fileobj:
+                    fileobj.write(validator or "")
+            with open(part, "ab" if resp.status_code == 206 else "wb") as fileobj:
+                written = _copy(resp, fileobj, chunk_size)
+            if total is not None and os.path.getsize(part) != total:
+                raise ScratchAPIError("Incomplete download: {0}".format(url))
+    os.replace(part, filename)
+    _discard(validator_file)
+    return written
+
+_TOKEN = re.compile(r'''
+    [ \t\n\r]*
+    (?:
+        (?P<punct>[{}\[\]:,])
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+      | (?P<literal>true|false|null)
+    )''', re.VERBOSE)
+
+_LITERALS = {"true": ("boolean", True), "false": ("boolean", False),
+             "null": ("null", None)}
+
+def _tokens(fileobj, chunk_size):
+    """Yield the (kind, text) tokens of the JSON in fileobj, reading it
+    chunk_size bytes at a time.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    eof = False
+    while True:
+        match = _TOKEN.match(buf, pos)
+        # A token ending the buffer (or a number followed by what could
+        # be its fraction or exponent) may go on in the next chunk.
+        if match is None or not eof and (
+                match.end() == len(buf)
+                or match.lastgroup == "number" and buf[match.end()] in ".eE"):
+            if eof:
+                if buf[pos:].strip():
+                    raise ValueError("Invalid JSON near: {0!r}".format(
+                        buf[pos:pos + 20]
+                    ))
+                return
+            chunk = fileobj.read(chunk_size)
+            eof = not chunk
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk, final=eof)
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        pos = match.end()
+        yield match.lastgroup, match.group(match.lastgroup)
+
+def _parse(fileobj, chunk_size):
+    """The pure Python parse(), for when ijson is not installed."""
+    path = []
+    maps = []
+    expect_key = False
+    for kind, text in _tokens(fileobj, chunk_size):
+        if kind == "punct":
+            if text == ",":
+                expect_key = maps[-1]
+            elif text in "{[":
+                is_map = text == "{"
+                yield (".".join(path), "start_map" if is_map else "start_array",
+                       None)
+                maps.append(is_map)
+                path.append("" if is_map else "item")
+                expect_key = is_map
+            elif text in "}]":
+                maps.pop()
+                path.pop()
+                yield ".".join(path), "end_map" if text == "}" else "end_array", None
+                expect_key = False
+            continue
+        if kind == "string":
+            value = json.loads(text) if "\\" in text else text[1:-1]
+            if expect_key:
+                path[-1] = value
+                yield ".".join(path[:-1]), "map_key", value
+                expect_key = False
+                continue
+            event = "string"
+        elif kind == "number":
+            value = int(text) if text.lstrip("-").isdigit() else float(text)
+            event = "number"
+        else:
+            event, value = _LITERALS[text]
+        yield ".".join(path), event, value
+
+def parse(fileobj, chunk_size=CHUNK_SIZE):
+    """Yield (prefix, event, value) for the JSON in fileobj, like
+    ijson.parse(): events are start_map, map_key, end_map, start_array,
+    end_array, string, number, boolean and null, and the prefix is the
+    path to the value, with "item" for array items.
+    """
+    if ijson is not None:
+        return ijson.parse(fileobj, buf_size=chunk_size)
+    return _parse(fileobj, chunk_size)
+
+class Target(GenericData):
+    """A sprite or the stage, as scan_project() found it."""
+    _repr_str = "<Target {name}>"
+    name = None
+    is_stage = False
+    blocks = 0
+
+class ProjectScan(GenericData):
+    """What scan_project() found in a project."""
+    _repr_str = "<ProjectScan ({blocks} blocks)>"
+    targets = ()
+    assets = ()
+    blocks = 0
+
+_ASSET_PREFIXES = ("targets.item.costumes.item", "targets.item.sounds.item")
+
+def scan_project(source, chunk_size=CHUNK_SIZE):
+    """Read a project's JSON (a filename or a binary file object) bit by
+    bit, and return a ProjectScan: targets (each with name, is_stage,
+    blocks and its assets), assets (every md5ext, once) and blocks.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as fileobj:
+            return scan_project(fileobj, chunk_size)
+    targets = []
+    asset = {}
+    for prefix, event, value in parse(source, chunk_size):
+        if prefix == "targets.item":
+            if event == "start_map":
+                targets.append(Target(assets=[]))
+        elif prefix == "targets.item.name" and event == "string":
+            targets[-1].name = value
+        elif prefix == "targets.item.isStage" and event == "boolean":
+            targets[-1].is_stage = value
+        elif prefix == "targets.item.blocks" and event == "map_key":
+            targets[-1].blocks += 1
+        elif prefix in _ASSET_PREFIXES:
+            if event == "start_map":
+                asset = {}
+            elif event == "end_map":
+                targets[-1].assets.append(asset.get("md5ext") or "{0}.{1}".format(
+                    asset.get("assetId"), asset.get("dataFormat")
+                ))
+        elif event == "string" and prefix.rsplit(".", 1)[0] in _ASSET_PREFIXES:
+            asset[prefix.rsplit(".", 1)[1]] = value
+    return ProjectScan(
+        targets=targets,
+        assets=list(dict.fromkeys(name for target in targets
+                                  for name in target.assets)),
+        blocks=sum(target.blocks for target in targets)
+    )
@@ -1,7 +1,21 @@
-"""Scratch API errors"""
-
-class ScratchAPIError(Exception):
-    """Generic Scratch API error."""
-
-class Maintenance(ScratchAPIError):
-    """Error when maintenance mode."""
+"""Scratch API errors"""
+
+class ScratchAPIError(Exception):
+    """Generic Scratch API error."""
+
+class Maintenance(ScratchAPIError):
+    """Error when maintenance mode."""
+
+class RateLimited(ScratchAPIError):
+    """Error when the API keeps answering 429 Too Many Requests."""
+
+class FetchError(ScratchAPIError):
+    """Error when loading one object of a fetch_many() batch.
+    target is the object (or its key, if none could be made), error is
+    what was raised.
+    """
+
+    def __init__(self, target, error):
+        super().__init__("{0}: {1!r}".format(target, error))
+        self.target = target
+        self.error = error
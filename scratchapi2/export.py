@@ -0,0 +1,242 @@
+"""
+Exporter - writes crawl results to NDJSON or CSV as they come.
+
+Projects, users, studios, classrooms, comments, GenericData (like the
+changes of a Watcher) and dicts are flattened to the fields the API
+sent, named by their path in its payload ("stats.views",
+"author.username", ...). Fields that were not loaded are left out;
+nothing is requested.
+
+    with Exporter("projects.ndjson.gz") as out:     # gzip, from the name
+        out.write_all(Paginator(User("griffpatch").projects))
+
+Rows are written batch_size at a time, so memory does not grow with the
+crawl. write() can be called from many threads: the one that fills a
+batch writes it, so producers faster than the disk are slowed down
+instead of queued in memory.
+
+class Exporter
+- write() / write_all()
+- flush()
+- close()
+flatten()
+"""
+import csv
+import gzip
+import io
+import json
+import threading
+from .gclass import GenericData
+from .user import Project, User, Studio, Classroom, Comment
+
+#pylint: disable=too-many-instance-attributes
+
+# The attribute naming each model, and its key in the payload.
+_IDENTITY = (
+    (Project, "projectid", "id"),
+    (User, "username", "username"),
+    (Studio, "studioid", "id"),
+    (Classroom, "classid", "id"),
+)
+
+# The attributes linking to another model: (attribute, payload path,
+# attribute of the linked object, or None if it is a plain value).
+_LINKS = {
+    Project: (("author", "author.username", "username"),
+              ("parent", "remix.parent", "projectid"),
+              ("root", "remix.root", "projectid")),
+    Studio: (("owner_id", "host", None),),
+    Classroom: (("educator", "educator.username", "username"),),
+}
+
+_COMMENT_FIELDS = (
+    ("comment_id", "id"),
+    ("content", "content"),
+    ("created", "datetime_created"),
+    ("last_modified", "datetime_modified"),
+    ("reply_count", "reply_count"),
+    ("visibility", "visibility"),
+)
+
+_MISSING = object()
+
+def _slot(obj, name):
+    """Return obj's attribute name if it is set, without loading obj."""
+    try:
+        return object.__getattribute__(obj, name)
+    except AttributeError:
+        return _MISSING
+
+def _flatten_into(result, prefix, value):
+    """Add value to result under prefix, flattening dicts and objects."""
+    if isinstance(value, (Project, User, Studio, Classroom, Comment,
+                          GenericData, dict)):
+        for key, item in flatten(value).items():
+            result[prefix + "." + key] = item
+    else:
+        result[prefix] = value
+
+def _flatten_model(obj):
+    result = {}
+    for klass, attr, key in _IDENTITY:
+        if isinstance(obj, klass):
+            result[key] = getattr(obj, attr)
+            break
+    for attr, keys in obj._fields: # pylint: disable=protected-access
+        value = _slot(obj, attr)
+        if value is not _MISSING:
+            _flatten_into(result, ".".join(keys), value)
+    for klass, links in _LINKS.items():
+        if not isinstance(obj, klass):
+            continue
+        for attr, key, linked in links:
+            value = _slot(obj, attr)
+            if value is _MISSING:
+                continue
+            if linked is not None and value is not None:
+                value = getattr(value, linked)
+            result[key] = value
+    return result
+
+def flatten(obj):
+    """Return obj (a model, GenericData or dict) as a flat dict of the
+    fields the API sent.
+    """
+    if isinstance(obj, Comment):
+        result = {key: getattr(obj, attr) for attr, key in _COMMENT_FIELDS}
+        result["author.username"] = obj.sender.username
+        result["parent_id"] = (obj.parent.comment_id
+                               if obj.parent is not None else None)
+        return result
+    if isinstance(obj, (Project, User, Studio, Classroom)):
+        return _flatten_model(obj)
+    if isinstance(obj, GenericData):
+        items = ((key, value) for key, value in vars(obj).items()
+                 if not key.startswith("_"))
+    elif isinstance(obj, dict):
+        items = obj.items()
+    else:
+        raise TypeError("Cannot export {0!r}".format(obj))
+    result = {}
+    for key, value in items:
+        _flatten_into(result, str(key), value)
+    return result
+
+def _cell(value):
+    """Return value as CSV writes it: lists and dicts as JSON."""
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return "" if value is None else value
+
+class Exporter(object):
+    """Writes flattened objects to target, a filename or a binary file
+    object, as "ndjson" or "csv" (by default, from the filename; else
+    ndjson). compress gzips it (by default, if the filename ends with
+    ".gz"). CSV columns are fields, or the keys of the first row;
+    other keys are left out.
+    """
+
+    def __init__(self, target, format=None, compress=None, fields=None, # pylint: disable=redefined-builtin
+                 batch_size=1000):
+        """Open target. Nothing is written until the first batch."""
+        name = target if isinstance(target, str) else ""
+        base = name[:-3] if name.endswith(".gz") else name
+        if compress is None:
+            compress = name.endswith(".gz")
+        if format is None:
+            format = "csv" if base.endswith(".csv") else "ndjson"
+        if format not in ("ndjson", "csv"):
+            raise ValueError("Unknown format: {0}".format(format))
+        self.format = format
+        self.fields = list(fields) if fields is not None else None
+        self.batch_size = batch_size
+        self.count = 0
+        self._owned = isinstance(target, str)
+        self._raw = (open(target, "wb") # pylint: disable=consider-using-with
+                     if self._owned else target)
+        self._file = (gzip.GzipFile(fileobj=self._raw, mode="wb")
+                      if compress else self._raw)
+        self._batch = []
+        self._header = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def __repr__(self):
+        """Represent the exporter."""
+        return "<Exporter {0} ({1} rows)>".format(self.format, self.count)
+
+    __str__ = __repr__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, obj):
+        """Add obj, writing the batch if it is full."""
+        row = flatten(obj)
+        with self._lock:
+            self._batch.append(row)
+            self.count += 1
+            if len(self._batch) < self.batch_size:
+                return
+            batch, self._batch = self._batch, []
+            # Taken before the first lock is let go, so batches are
+            # written in order.
+            self._write_lock.acquire() # pylint: disable=consider-using-with
+        try:
+            self._write(batch)
+        finally:
+            self._write_lock.release()
+
+    def write_all(self, objs):
+        """Write every object of the iterable objs, and return how many
+        there were. They are taken one by one, as they are written.
+        """
+        count = 0
+        for obj in objs:
+            self.write(obj)
+            count += 1
+        return count
+
+    def _write(self, batch):
+        """Write batch (a list of flat dicts) and flush the file."""
+        if self.format == "ndjson":
+            data = "".join(json.dumps(row, ensure_ascii=False, default=str)
+                           + "\n" for row in batch)
+        else:
+            text = io.StringIO()
+            writer = csv.writer(text)
+            if not self._header:
+                if self.fields is None:
+                    self.fields = list(batch[0])
+                writer.writerow(self.fields)
+                self._header = True
+            for row in batch:
+                writer.writerow([_cell(row.get(field))
+                                 for field in self.fields])
+            data = text.getvalue()
+        self._file.write(data.encode("utf-8"))
+        self._file.flush()
+
+    def flush(self):
+        """Write the rows not written yet."""
+        with self._lock:
+            batch, self._batch = self._batch, []
+            self._write_lock.acquire() # pylint: disable=consider-using-with
+        try:
+            if batch:
+                self._write(batch)
+        finally:
+            self._write_lock.release()
+
+    def close(self):
+        """Write the rest, and close the file (or finish the gzip stream
+        of a file object, which is left open).
+        """
+        self.flush()
+        if self._file is not self._raw:
+            self._file.close()
+        if self._owned:
+            self._raw.close()
@@ -1,87 +1,163 @@
-"""
-Front Page APIs.
-Contains:
-class FrontPage (ALWAYS use like FrontPage())
-- news()
-- featured_projects()
-- new_projects()
-- most_remixed()
-- most_loved()
-- featured_studios()
-- sds()
-- curator()
-"""
-from .user import Project, User, Studio
-from .gclass import GenericData
-from .api import APISingleton
-
-GETINFO = False
-
-class FrontPage(APISingleton):
-    """The Front Page of the Scratch website."""
-
-    def news(self, limit=3, offset=0):
-        """Get Scratch news."""
-        result = self._request('news?limit={0}&offset={1}', limit, offset)
-        class News(GenericData):
-            """Represents a news item."""
-            _repr_str = '<News {newsid}>'
-            newsid = None
-        for item in result:
-            yield News(
-                newsid=item["id"],
-                timestamp=item["stamp"],
-                title=item["headline"],
-                url=item["url"],
-                image=item["image"],
-                description=item["copy"]
-            )
-
-    def featured_projects(self):
-        """Get featured Projects."""
-        result = self._request('proxy/featured')["community_featured_projects"]
-        for item in result:
-            yield Project(item["id"], getinfo=GETINFO)
-
-    def new_projects(self): # pylint: disable=no-self-use
-        """Removed. Get new Projects."""
-        # pylint: enable=no-self-use
-        raise Exception("This function has been removed and is no longer available.")
-
-    def most_remixed_projects(self):
-        """Get most remixed Projects."""
-        result = self._request('proxy/featured')["community_most_remixed_projects"]
-        for item in result:
-            yield Project(item["id"], getinfo=GETINFO)
-
-    def most_loved_projects(self):
-        """Get most loved Projects."""
-        result = self._request('proxy/featured')["community_most_loved_projects"]
-        for item in result:
-            yield Project(item["id"], getinfo=GETINFO)
-
-    def curated_projects(self):
-        """Get the currently curated Projects and the current curator."""
-        result = self._request('proxy/featured')["curator_top_projects"]
-        for item in result:
-            yield GenericData(
-                project=Project(item["id"], getinfo=GETINFO),
-                curator=User(item["curator_name"], getinfo=GETINFO),
-                _repr_str='<Curated Project>'
-            )
-
-    def sds_projects(self):
-        """Get SDS Projects."""
-        result = self._request('proxy/featured')["scratch_design_studio"]
-        for item in result:
-            yield GenericData(
-                project=Project(item["id"], getinfo=GETINFO),
-                studio=Studio(item["gallery_id"], getinfo=GETINFO),
-                _repr_str='<SDS Project>'
-            )
-
-    def featured_studios(self):
-        """Get featured Studios."""
-        result = self._request('proxy/featured')["community_featured_studios"]
-        for item in result:
-            yield Studio(item["id"], getinfo=GETINFO)
+"""
+Front Page APIs.
+Contains:
+class FrontPage (ALWAYS use like FrontPage())
+- news()
+- featured_projects()
+- new_projects()
+- most_remixed()
+- most_loved()
+- featured_studios()
+- sds()
+- curator()
+- snapshot()
+- refresh()
+"""
+import threading
+import time
+from .user import Project, User, Studio
+from .gclass import GenericData
+from .api import APISingleton
+
+def _featured_project(item):
+    """Turn a proxy/featured project item into a project payload."""
+    project = {
+        "id": item["id"],
+        "title": item["title"],
+        "image": item["thumbnail_url"],
+        "author": {"username": item["creator"]}
+    }
+    if "love_count" in item:
+        project["stats"] = {"loves": item["love_count"]}
+    return project
+
+def _featured_studio(item):
+    """Turn a proxy/featured studio item into a studio payload."""
+    return {
+        "id": item["id"],
+        "title": item["title"],
+        "image": item["thumbnail_url"]
+    }
+
+class Snapshot(GenericData):
+    """Every section of the front page, from one proxy/featured."""
+    _repr_str = '<FrontPage snapshot>'
+    timestamp = None
+    featured_projects = ()
+    most_remixed_projects = ()
+    most_loved_projects = ()
+    curated_projects = ()
+    sds_projects = ()
+    featured_studios = ()
+
+def _sections(featured, project_class=Project, studio_class=Studio,
+              user_class=User):
+    """Make a snapshot out of a proxy/featured document, with a list of
+    hydrated objects for every section.
+    """
+    def projects(key):
+        return [project_class.from_json(_featured_project(item))
+                for item in featured[key]]
+    return Snapshot(
+        featured_projects=projects("community_featured_projects"),
+        most_remixed_projects=projects("community_most_remixed_projects"),
+        most_loved_projects=projects("community_most_loved_projects"),
+        curated_projects=[
+            GenericData(
+                project=project_class.from_json(_featured_project(item)),
+                curator=user_class(item["curator_name"]),
+                _repr_str='<Curated Project>'
+            )
+            for item in featured["curator_top_projects"]
+        ],
+        sds_projects=[
+            GenericData(
+                project=project_class.from_json(_featured_project(item)),
+                studio=studio_class.from_json({
+                    "id": item["gallery_id"],
+                    "title": item["gallery_title"]
+                }),
+                _repr_str='<SDS Project>'
+            )
+            for item in featured["scratch_design_studio"]
+        ],
+        featured_studios=[studio_class.from_json(_featured_studio(item))
+                          for item in featured["community_featured_studios"]],
+        timestamp=time.time()
+    )
+
+class FrontPage(APISingleton):
+    """The Front Page of the Scratch website.
+
+    Every section comes from one download of proxy/featured (a
+    snapshot), which is kept for ttl seconds.
+    """
+
+    ttl = 300
+    _snapshot = None
+    _snapshot_lock = threading.Lock()
+
+    def news(self, limit=3, offset=0):
+        """Get Scratch news."""
+        result = self._request('news?limit={0}&offset={1}', limit, offset)
+        class News(GenericData):
+            """Represents a news item."""
+            _repr_str = '<News {newsid}>'
+            newsid = None
+        for item in result:
+            yield News(
+                newsid=item["id"],
+                timestamp=item["stamp"],
+                title=item["headline"],
+                url=item["url"],
+                image=item["image"],
+                description=item["copy"]
+            )
+
+    def snapshot(self, max_age=None):
+        """Return every section of the front page, as a Snapshot with
+        featured_projects, most_remixed_projects, most_loved_projects,
+        curated_projects, sds_projects and featured_studios lists.
+        proxy/featured is downloaded again only if the last snapshot is
+        older than max_age (by default, ttl) seconds.
+        """
+        if max_age is None:
+            max_age = self.ttl
+        with self._snapshot_lock:
+            if (self._snapshot is None
+                    or time.time() - self._snapshot.timestamp >= max_age):
+                self._snapshot = _sections(self._request('proxy/featured'))
+            return self._snapshot
+
+    def refresh(self):
+        """Download the front page again now, and return the snapshot."""
+        return self.snapshot(max_age=0)
+
+    def featured_projects(self):
+        """Get featured Projects."""
+        yield from self.snapshot().featured_projects
+
+    def new_projects(self): # pylint: disable=no-self-use
+        """Removed. Get new Projects."""
+        # pylint: enable=no-self-use
+        raise Exception("This function has been removed and is no longer available.")
+
+    def most_remixed_projects(self):
+        """Get most remixed Projects."""
+        yield from self.snapshot().most_remixed_projects
+
+    def most_loved_projects(self):
+        """Get most loved Projects."""
+        yield from self.snapshot().most_loved_projects
+
+    def curated_projects(self):
+        """Get the currently curated Projects and the current curator."""
+        yield from self.snapshot().curated_projects
+
+    def sds_projects(self):
+        """Get SDS Projects."""
+        yield from self.snapshot().sds_projects
+
+    def featured_studios(self):
+        """Get featured Studios."""
+        yield from self.snapshot().featured_studios
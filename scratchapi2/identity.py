@@ -0,0 +1,43 @@
+"""
+IdentityMap - one object per project, user, studio or classroom.
+
+Every transport (client) has one. Asking for User("griffpatch") twice,
+or seeing the same project in two listings, gives the same object, so
+what one of them loaded is there for the other. Objects are only
+weakly held: once nothing else refers to them, they are dropped.
+"""
+import threading
+import weakref
+
+class IdentityMap(object):
+    """Maps (class, key) to the live object for it."""
+
+    def __init__(self):
+        """Initialize an empty map."""
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Represent the map."""
+        return "<IdentityMap ({0} objects)>".format(len(self))
+
+    __str__ = __repr__
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, cls, key):
+        """Return the object of cls for key, making an empty one (which
+        the caller initializes) if there is none alive.
+        """
+        with self._lock:
+            obj = self._objects.get((cls, key))
+            if obj is None:
+                obj = object.__new__(cls)
+                self._objects[cls, key] = obj
+            return obj
+
+    def clear(self):
+        """Forget every object. Objects made later are new ones."""
+        with self._lock:
+            self._objects.clear()
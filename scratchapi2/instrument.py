@@ -0,0 +1,177 @@
+"""
+Instruments - hooks called around every request of a Transport (or
+AsyncTransport), and Metrics, the built-in one counting requests per
+endpoint.
+
+    metrics = Metrics()
+    Transport.default().instruments.add(metrics)
+    Project(104).title
+    metrics.export()["projects/{0}"]["requests"]        # 1
+
+    @Transport.default().instruments.on_response
+    def log(event):
+        print(event.endpoint, event.status, event.latency)
+
+Hooks are given a RequestEvent. Before the request, it has endpoint
+(the path template, like "projects/{0}/comments") and url; after it,
+also status, latency (seconds, up to the body, or to the headers for
+streamed downloads), bytes, cache_hit, retries and error (what was
+raised, if anything). With no hooks, requests are not timed at all.
+
+Both kinds of transport can share one Instruments:
+
+    AsyncTransport(instruments=Transport.default().instruments).install()
+
+class Instruments
+- on_request()
+- on_response()
+- add()
+- remove()
+class Metrics
+- export()
+- reset()
+"""
+import bisect
+import threading
+from .gclass import GenericData
+
+class RequestEvent(GenericData):
+    """One request, as hooks see it."""
+    _repr_str = "<RequestEvent {endpoint} {status}>"
+    endpoint = None
+    url = None
+    status = None
+    latency = None
+    bytes = None
+    cache_hit = False
+    retries = 0
+    error = None
+
+class Instruments(object):
+    """The hooks of a Transport or AsyncTransport."""
+
+    def __init__(self):
+        """Initialize without hooks."""
+        self.before = []
+        self.after = []
+        # Checked on every request: a bool is cheaper than two lists.
+        self.active = False
+
+    def __repr__(self):
+        """Represent the hooks."""
+        return "<Instruments ({0} before, {1} after)>".format(
+            len(self.before), len(self.after)
+        )
+
+    __str__ = __repr__
+
+    def _update(self):
+        self.active = bool(self.before or self.after)
+
+    def on_request(self, func):
+        """Call func(event) before every request. Returns func, so this
+        can be used as a decorator.
+        """
+        self.before.append(func)
+        self._update()
+        return func
+
+    def on_response(self, func):
+        """Call func(event) after every request, even a failed one.
+        Returns func, so this can be used as a decorator.
+        """
+        self.after.append(func)
+        self._update()
+        return func
+
+    def add(self, hook):
+        """Add an object with a before(event) method, an after(event)
+        method or both, like a Metrics.
+        """
+        if hasattr(hook, "before"):
+            self.on_request(hook.before)
+        if hasattr(hook, "after"):
+            self.on_response(hook.after)
+        return hook
+
+    def remove(self, hook):
+        """Remove a function or an object given to add()."""
+        for hooks, func in ((self.before, getattr(hook, "before", hook)),
+                            (self.after, getattr(hook, "after", hook))):
+            if func in hooks:
+                hooks.remove(func)
+        self._update()
+
+# Upper bounds (seconds) of the latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+           float("inf"))
+
+class _Endpoint(object):
+    """The counters of one endpoint."""
+    __slots__ = ("requests", "errors", "bytes", "cache_hits", "retries",
+                 "latency_sum", "histogram")
+
+    def __init__(self):
+        self.requests = self.errors = self.bytes = 0
+        self.cache_hits = self.retries = 0
+        self.latency_sum = 0.0
+        self.histogram = [0] * len(BUCKETS)
+
+class Metrics(object):
+    """Counts requests, errors (4xx, 5xx or raised), bytes downloaded,
+    cache hits and retries, and keeps a histogram of the latencies, per
+    endpoint.
+    """
+
+    def __init__(self):
+        """Initialize the metrics at zero."""
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Represent the metrics."""
+        return "<Metrics ({0} endpoints)>".format(len(self._endpoints))
+
+    __str__ = __repr__
+
+    def after(self, event):
+        """Count event. (Metrics is given to Instruments.add().)"""
+        with self._lock:
+            counters = self._endpoints.get(event.endpoint)
+            if counters is None:
+                counters = self._endpoints[event.endpoint] = _Endpoint()
+            counters.requests += 1
+            if event.error is not None or (event.status or 0) >= 400:
+                counters.errors += 1
+            if event.cache_hit:
+                counters.cache_hits += 1
+            else:
+                counters.bytes += event.bytes or 0
+            counters.retries += event.retries
+            if event.latency is not None:
+                counters.latency_sum += event.latency
+                counters.histogram[bisect.bisect_left(BUCKETS,
+                                                      event.latency)] += 1
+
+    def export(self):
+        """Return the metrics as a dict (that json.dumps() takes) keyed
+        by endpoint. The histogram maps each bucket's upper bound to the
+        number of requests that took up to that long, but longer than
+        the bound before it.
+        """
+        with self._lock:
+            return {endpoint: {
+                "requests": counters.requests,
+                "errors": counters.errors,
+                "bytes": counters.bytes,
+                "cache_hits": counters.cache_hits,
+                "retries": counters.retries,
+                "latency_sum": counters.latency_sum,
+                "histogram": {str(bound): count for bound, count
+                              in zip(BUCKETS, counters.histogram)},
+            } for endpoint, counters in self._endpoints.items()}
+
+    def reset(self):
+        """Set every counter back to zero."""
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,43 @@
+"""
+JSON decoding of response bodies, with the fastest library installed.
+
+Bodies are decoded straight from their bytes, not from the text
+requests would make of them first. orjson is used if it is installed,
+else ujson, else the json module; Transport(decoder=...) picks another
+one, by name or as a function taking bytes:
+
+    Transport(decoder="json").install()
+
+get_decoder()
+DECODERS (the names)
+"""
+import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# In order of preference; None where the library is not installed.
+DECODERS = {
+    "orjson": orjson.loads if orjson is not None else None, # pylint: disable=no-member
+    "ujson": ujson.loads if ujson is not None else None,
+    # json.loads takes bytes too, finding the encoding on its own.
+    "json": json.loads,
+}
+
+def get_decoder(decoder=None):
+    """Return the function decoding bytes that decoder names: one of
+    DECODERS, a function (returned as it is), or None for the fastest
+    installed.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is None:
+        return next(loads for loads in DECODERS.values() if loads is not None)
+    if DECODERS.get(decoder) is None:
+        raise ValueError("JSON decoder not available: {0}".format(decoder))
+    return DECODERS[decoder]
@@ -0,0 +1,655 @@
+"""
+MockServer - a local stand-in for the Scratch servers.
+
+It answers every endpoint this library uses (projects, users, studios,
+classrooms, comments and replies, proxy/featured, news, search,
+statistics, the translate service, project JSON and assets) with made
+up, but well-formed and always the same, data. Point a Transport at it
+to test or measure without the network:
+
+    with MockServer(latency=0.05) as server:
+        server.install()            # Transport(base_urls=server.base_urls)
+        Project(104).title          # 'Project 104'
+
+install_async() does the same for the AsyncTransport of scratchapi2.aio.
+
+Responses carry an ETag, and If-None-Match, Range and If-Range are
+honored, the way the real servers do.
+
+Latency can be added to every response, and errors to some:
+
+    server.inject(r"/api/projects/\\d+$", status=503, count=2)
+    server.inject(r"/api/users/", status=429, retry_after=1)
+    server.inject(r"/projects/", delay=2)           # a slow body
+
+Real responses can be recorded once and replayed later (where the
+recording has no answer, the made up data is used):
+
+    MockServer(record="fixtures.json")      # asks the real servers
+    MockServer(replay="fixtures.json")
+
+class MockServer
+- start() / stop()
+- base_urls
+- install() / install_async()
+- inject()
+- add()
+- requests, bytes_sent
+"""
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+import requests
+from .transport import Transport
+from .aio import AsyncTransport
+
+#pylint: disable=too-many-instance-attributes
+
+# Path prefixes of the server, and the real URLs they stand for.
+UPSTREAM = {
+    "/api/": "https://api.scratch.mit.edu/",
+    "/site/": "https://scratch.mit.edu/",
+    "/translate/": "https://translate-service.scratch.mit.edu/",
+    "/projects/": "https://projects.scratch.mit.edu/",
+    "/cdn/": "https://cdn.assets.scratch.mit.edu/",
+}
+
+DATE = "2019-01-01T00:00:00.000Z"
+
+# The users of the follow graph (a prime, so it can be walked back).
+_USERS = 100003
+
+def _asset(index, ext):
+    """Return the name ("<md5>.<ext>") and body of a made up asset."""
+    body = "{0} asset {1}\n".format(ext, index).encode() * (64 + index % 64)
+    return "{0}.{1}".format(hashlib.md5(body).hexdigest(), ext), body
+
+class _Data(object):
+    """The made up payloads."""
+
+    def __init__(self, listing_size, remix_depth):
+        self.listing_size = listing_size
+        self.remix_depth = remix_depth
+        # Listing path -> the number of items added to it.
+        self.added = {}
+        self.assets = {}
+        for index in range(64):
+            for ext in ("svg", "png", "wav"):
+                name, body = _asset(index, ext)
+                self.assets[name] = body
+        self._asset_names = list(self.assets)
+
+    @staticmethod
+    def user(username, userid=None):
+        """A user payload."""
+        if userid is None:
+            # The users of the follow graph are numbered in order;
+            # others get an ID from their name.
+            match = re.fullmatch(r"user(\d+)", username)
+            userid = (int(match.group(1)) + 1 if match else int(hashlib.md5(
+                username.lower().encode()
+            ).hexdigest()[:12], 16) % 100000000)
+        return {
+            "id": userid,
+            "username": username,
+            "scratchteam": username.lower() == "scratchcat",
+            "history": {"joined": DATE},
+            "profile": {
+                "id": userid,
+                "images": {"90x90": "https://cdn2.scratch.mit.edu/get_image/"
+                                    "user/{0}_90x90.png".format(userid)},
+                "status": "Status of {0}".format(username),
+                "bio": "Bio of {0}".format(username),
+                "country": "Japan",
+            },
+        }
+
+    def project(self, projectid):
+        """A project payload. Projects above 10 are remixes of
+        projectid // 10.
+        """
+        parent = projectid // 10 if projectid >= 10 else None
+        root = parent
+        while root is not None and root >= 10:
+            root //= 10
+        return {
+            "id": projectid,
+            "title": "Project {0}".format(projectid),
+            "description": "Notes of project {0}".format(projectid),
+            "instructions": "Instructions of project {0}".format(projectid),
+            "visibility": "visible",
+            "public": True,
+            "comments_allowed": True,
+            "is_published": True,
+            "author": self.user("user{0}".format(projectid % 97)),
+            "image": "https://cdn2.scratch.mit.edu/get_image/project/"
+                     "{0}_480x360.png".format(projectid),
+            "history": {"created": DATE, "modified": DATE, "shared": DATE},
+            "stats": {"views": projectid * 3, "loves": projectid % 50,
+                      "favorites": projectid % 40, "comments": projectid % 30,
+                      "remixes": self._remix_count(projectid)},
+            "remix": {"parent": parent, "root": root},
+        }
+
+    def _remix_count(self, projectid):
+        return 3 if len(str(projectid)) - 1 < self.remix_depth else 0
+
+    def studio(self, studioid):
+        """A studio payload."""
+        return {
+            "id": studioid,
+            "title": "Studio {0}".format(studioid),
+            "host": 1000 + studioid,
+            "description": "Description of studio {0}".format(studioid),
+            "visibility": "visible",
+            "public": True,
+            "open_to_all": False,
+            "comments_allowed": True,
+            "image": "https://cdn2.scratch.mit.edu/get_image/gallery/"
+                     "{0}_170x100.png".format(studioid),
+            "history": {"created": DATE, "modified": DATE},
+            "stats": {"comments": 10, "followers": studioid % 100,
+                      "managers": 3, "projects": self.listing_size},
+        }
+
+    def classroom(self, classid):
+        """A classroom payload."""
+        return {
+            "id": classid,
+            "title": "Class {0}".format(classid),
+            "description": "What we are working on in class {0}".format(classid),
+            "status": "About class {0}".format(classid),
+            "date_start": DATE,
+            "date_end": None,
+            "images": {},
+            "educator": self.user("teacher{0}".format(classid)),
+        }
+
+    def comment(self, commentid, parent=None):
+        """A comment payload. Every third top-level comment has replies."""
+        return {
+            "id": commentid,
+            "parent_id": parent,
+            "commentee_id": None,
+            "content": "Comment {0}".format(commentid),
+            "datetime_created": DATE,
+            "datetime_modified": DATE,
+            "visibility": "visible",
+            "author": {"id": commentid % 13, "username":
+                           "commenter{0}".format(commentid % 13),
+                       "scratchteam": False, "image": ""},
+            "reply_count": 2 if parent is None and commentid % 3 == 0 else 0,
+        }
+
+    def project_json(self, projectid):
+        """The JSON of a project, with a few targets, blocks and assets."""
+        names = self._asset_names
+        targets = []
+        for index in range(4):
+            first = (projectid * 5 + index * 3) % len(names)
+            assets = [names[(first + k) % len(names)] for k in range(3)]
+            targets.append({
+                "isStage": index == 0,
+                "name": "Stage" if index == 0 else "Sprite{0}".format(index),
+                "variables": {}, "lists": {}, "broadcasts": {},
+                "blocks": {
+                    "block{0}".format(k): {
+                        "opcode": "motion_movesteps",
+                        "next": "block{0}".format(k + 1) if k < 49 else None,
+                        "parent": "block{0}".format(k - 1) if k else None,
+                        "inputs": {"STEPS": [1, [4, "10"]]},
+                        "fields": {}, "shadow": False, "topLevel": k == 0,
+                    } for k in range(50)
+                },
+                "costumes": [{
+                    "assetId": name.split(".")[0], "name": name,
+                    "md5ext": name, "dataFormat": name.split(".")[1],
+                    "rotationCenterX": 0, "rotationCenterY": 0,
+                } for name in assets if not name.endswith(".wav")],
+                "sounds": [{
+                    "assetId": name.split(".")[0], "name": name,
+                    "md5ext": name, "dataFormat": "wav", "rate": 48000,
+                } for name in assets if name.endswith(".wav")],
+            })
+        return {"targets": targets, "monitors": [], "extensions": [],
+                "meta": {"semver": "3.0.0", "vm": "0.2.0", "agent": "mock"}}
+
+    def featured(self):
+        """The proxy/featured document."""
+        def item(index, **extra):
+            result = {"id": index, "title": "Featured {0}".format(index),
+                      "thumbnail_url": "//cdn2.scratch.mit.edu/{0}".format(index),
+                      "creator": "user{0}".format(index % 97),
+                      "love_count": index, "remixers_count": index % 7,
+                      "type": "project"}
+            result.update(extra)
+            return result
+        return {
+            "community_featured_projects": [item(i) for i in range(1, 21)],
+            "community_most_remixed_projects": [item(i) for i in range(21, 41)],
+            "community_most_loved_projects": [item(i) for i in range(41, 61)],
+            "curator_top_projects": [item(i, curator_name="curator")
+                                     for i in range(61, 71)],
+            "scratch_design_studio": [item(i, gallery_id=5, gallery_title="SDS")
+                                      for i in range(71, 81)],
+            "community_featured_studios": [
+                {"id": i, "title": "Studio {0}".format(i),
+                 "thumbnail_url": "//cdn2.scratch.mit.edu/{0}".format(i),
+                 "type": "gallery"} for i in range(1, 11)
+            ],
+            "community_newest_projects": [item(i) for i in range(81, 101)],
+        }
+
+    @staticmethod
+    def monthly():
+        """The statistics/data/monthly/ document."""
+        def series(scale):
+            return {"values": [{"x": 1167609600000 + month * 2629800000,
+                                "y": month * scale} for month in range(144)]}
+        return {
+            "_TS": time.time(),
+            "comment_data": [series(1), series(2), series(3)],
+            "activity_data": [series(4), series(5), series(6)],
+            "active_user_data": [series(7), series(8)],
+            "project_data": [series(9), series(10)],
+            "age_distribution_data": [{"values": [{"x": age, "y": age * 1000}
+                                                  for age in range(5, 80)]}],
+            "country_distribution": {"Japan": 100, "United States": 300},
+        }
+
+    def follow(self, username, direction, index):
+        """The number of the user at index in username's following or
+        followers list. The users, user0 to user100002, make a graph
+        where userN follows user(3N + k^3 * 7919) (mod 100003) for k
+        from 1 to listing_size; so the two lists agree. Other users
+        follow from where their ID falls in it.
+        """
+        number = (int(username[4:]) if re.fullmatch(r"user\d+", username)
+                  else self.user(username)["id"]) % _USERS
+        offset = (index + 1) ** 3 * 7919
+        if direction == "following":
+            return (3 * number + offset) % _USERS
+        return (number - offset) * pow(3, _USERS - 2, _USERS) % _USERS
+
+    def listing(self, make, query, size=None, path=None):
+        """A page of a listing of size items made by make(index). The
+        items added to path come first, newest first.
+        """
+        limit = int(query.get("limit", ["20"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        size = self.listing_size if size is None else size
+        added = self.added.get(path, 0)
+        end = min(offset + limit, size + added)
+        return [make(size + added - 1 - index) if index < added
+                else make(index - added) for index in range(offset, end)]
+
+    def route(self, prefix, path, query):
+        """Return the payload for path (after prefix), or None."""
+        # pylint: disable=too-many-return-statements,too-many-branches
+        if prefix == "/translate/":
+            if path == "":
+                return {"ok": True}
+            if path == "supported":
+                return {"result": [{"code": code, "name": code.upper()}
+                                   for code in ("en", "ja", "fr", "de", "es")]}
+            if path == "translate":
+                return {"result": "[{0}] {1}".format(query["language"][0],
+                                                     query["text"][0])}
+            return None
+        if prefix == "/site/":
+            if path == "statistics/data/daily/":
+                return {"PROJECT_COUNT": 100, "STUDIO_COUNT": 20,
+                        "USER_COUNT": 50, "COMMENT_COUNT": 300,
+                        "_TS": time.time()}
+            if path == "statistics/data/monthly/":
+                return self.monthly()
+            match = re.fullmatch(r"accounts/check_(username|email)/(.*)", path)
+            if match:
+                return [{match.group(1): match.group(2),
+                         "msg": "valid " + match.group(1)}]
+            return None
+        if path == "":
+            return {"website": "scratch.mit.edu", "api": "api.scratch.mit.edu",
+                    "help": "help@scratch.mit.edu"}
+        if path == "health":
+            return {"version": "mock", "uptime": 1, "load": [0, 0, 0],
+                    "sql": {"ssl": True, "min": 0, "max": 1},
+                    "cache": {"connected": True, "ready": True}}
+        if path == "projects/count/all":
+            return {"count": 100}
+        if path == "proxy/featured":
+            return self.featured()
+        if path == "news":
+            return self.listing(lambda i: {
+                "id": i, "stamp": DATE, "headline": "News {0}".format(i),
+                "url": "https://scratch.mit.edu/", "image": "",
+                "copy": "Copy of news {0}".format(i)
+            }, query)
+        if path == "search/projects":
+            return self.listing(lambda i: self.project(i + 1), query)
+        if path == "search/studios":
+            return self.listing(lambda i: self.studio(i + 1), query)
+        match = re.fullmatch(r"(projects|studios|users)/(\w+)/comments"
+                             r"(?:/(\d+)(/replies)?)?", path)
+        if match:
+            if match.group(4):
+                parent = int(match.group(3))
+                if parent % 3:
+                    return []
+                return self.listing(
+                    lambda i: self.comment(parent * 100 + i + 1, parent), query,
+                    size=2
+                )
+            if match.group(3):
+                commentid = int(match.group(3))
+                return self.comment(commentid,
+                                    commentid // 100 if commentid > 100 else None)
+            return self.listing(lambda i: self.comment(i + 1), query,
+                                path=path)
+        match = re.fullmatch(r"projects/(\d+)(?:/(remixes|studios))?", path)
+        if match:
+            projectid = int(match.group(1))
+            if match.group(2) == "remixes":
+                return self.listing(lambda i: self.project(projectid * 10 + i),
+                                    query, size=self._remix_count(projectid))
+            if match.group(2) == "studios":
+                return self.listing(lambda i: self.studio(i + 1), query, size=5)
+            return self.project(projectid)
+        match = re.fullmatch(r"users/(\w+)(?:/(.+))?", path)
+        if match:
+            username, sub = match.groups()
+            if sub is None:
+                return self.user(username)
+            if sub == "messages/count":
+                return {"count": 3}
+            if sub in ("projects", "favorites"):
+                base = sum(map(ord, username)) * 1000
+                return self.listing(lambda i: self.project(base + i), query,
+                                    path=path)
+            if sub in ("following", "followers"):
+                return self.listing(lambda i: self.user("user{0}".format(
+                    self.follow(username, sub, i)
+                )), query)
+            if sub == "studios/curate":
+                return self.listing(lambda i: self.studio(i + 1), query)
+            return None
+        match = re.fullmatch(r"studios/(\d+)(/projects)?", path)
+        if match:
+            studioid = int(match.group(1))
+            if match.group(2):
+                def item(index):
+                    project = self.project(studioid * 1000 + index)
+                    return {"id": project["id"], "title": project["title"],
+                            "image": project["image"],
+                            "creator_id": project["author"]["id"],
+                            "username": project["author"]["username"],
+                            "avatar": {}, "actor_id": 1}
+                return self.listing(item, query, path=path)
+            return self.studio(studioid)
+        match = re.fullmatch(r"classrooms/(\d+)", path)
+        if match:
+            return self.classroom(int(match.group(1)))
+        return None
+
+class _Rule(object):
+    """An injected error or delay."""
+
+    def __init__(self, pattern, status, count, retry_after, delay):
+        self.pattern = re.compile(pattern)
+        self.status = status
+        self.count = count
+        self.retry_after = retry_after
+        self.delay = delay
+
+class _HTTPServer(ThreadingMixIn, HTTPServer):
+    """An HTTPServer answering every connection in a thread of its own."""
+    daemon_threads = True
+
+class MockServer(object):
+    """A local server standing in for every Scratch host.
+
+    latency is the seconds to wait before every response. listing_size
+    is how long listings (projects of a user, comments, ...) are, and
+    remix_depth how deep remix trees go. record or replay is the
+    filename of a recording (see the module's docstring). port 0 picks
+    a free one.
+    """
+
+    def __init__(self, latency=0.0, listing_size=100, remix_depth=3,
+                 record=None, replay=None, host="127.0.0.1", port=0):
+        """Initialize the server. It starts with start() (or with)."""
+        self.latency = latency
+        self.data = _Data(listing_size, remix_depth)
+        self.record = record
+        self.replay = replay
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.bytes_sent = 0
+        self._rules = []
+        self._lock = threading.Lock()
+        self._recording = {}
+        self._server = None
+        if replay is not None:
+            with open(replay, encoding="utf-8") as fileobj:
+                self._recording = json.load(fileobj)
+
+    def __repr__(self):
+        """Represent the server."""
+        return "<MockServer {0}>".format(self.url)
+
+    __str__ = __repr__
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self):
+        """The URL of the server, like "http://127.0.0.1:8000"."""
+        return "http://{0}:{1}".format(self.host, self.port)
+
+    @property
+    def base_urls(self):
+        """The base_urls for Transport that send everything here."""
+        return {upstream: self.url + prefix
+                for prefix, upstream in UPSTREAM.items()}
+
+    def start(self):
+        """Start serving in a background thread."""
+        server = _HTTPServer((self.host, self.port), _handler(self))
+        self.port = server.server_address[1]
+        self._server = server
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving, and save the recording if recording."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.record is not None:
+            with self._lock, open(self.record, "w", encoding="utf-8") as fileobj:
+                json.dump(self._recording, fileobj, indent=1, sort_keys=True)
+
+    def install(self, **kwargs):
+        """Make a Transport sending every request here (kwargs are
+        passed to it), install it and return it.
+        """
+        return Transport(base_urls=self.base_urls, **kwargs).install()
+
+    def install_async(self, **kwargs):
+        """Make an AsyncTransport (of scratchapi2.aio) sending every
+        request here, install it and return it.
+        """
+        return AsyncTransport(base_urls=self.base_urls, **kwargs).install()
+
+    def inject(self, pattern, status=None, count=None, retry_after=None,
+               delay=None):
+        """Make the requests whose path (like "/api/projects/104")
+        matches the regular expression pattern fail with status, or send
+        their body slowly over delay seconds, count times (None: always).
+        retry_after is sent as the Retry-After header.
+        """
+        with self._lock:
+            self._rules.append(_Rule(pattern, status, count, retry_after,
+                                     delay))
+
+    def add(self, path, count=1):
+        """Put count new items at the top of the listing at path, like
+        "/api/users/griffpatch/projects" (new projects), the way the API
+        lists the newest first. Works for the projects of users and
+        studios, and the comments of projects, studios and users.
+        """
+        with self._lock:
+            key = path[len("/api/"):]
+            self.data.added[key] = self.data.added.get(key, 0) + count
+
+    def clear(self):
+        """Remove every injected error, and reset the counters."""
+        with self._lock:
+            self._rules = []
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def _rule(self, path):
+        """Return the injected rule for path, if any, and count it."""
+        with self._lock:
+            self.requests += 1
+            for rule in self._rules:
+                if rule.pattern.search(path) and rule.count != 0:
+                    if rule.count is not None:
+                        rule.count -= 1
+                    return rule
+        return None
+
+    def respond(self, target):
+        """Return (status, content type, body) for the request target
+        (path and query).
+        """
+        if target in self._recording:
+            entry = self._recording[target]
+            return (entry["status"], entry["content_type"],
+                    base64.b64decode(entry["body"]))
+        split = urlsplit(target)
+        for prefix, upstream in UPSTREAM.items():
+            if split.path.startswith(prefix):
+                break
+        else:
+            return 404, "text/plain", b"Not Found"
+        if self.record is not None:
+            return self._record(target, upstream + target[len(prefix):])
+        path = split.path[len(prefix):]
+        if prefix == "/projects/":
+            if not path.isdigit():
+                return 404, "text/plain", b"Not Found"
+            return 200, "application/json", json.dumps(
+                self.data.project_json(int(path))
+            ).encode()
+        if prefix == "/cdn/":
+            match = re.fullmatch(r"internalapi/asset/([\w.]+)/get/", path)
+            if match is None or match.group(1) not in self.data.assets:
+                return 404, "text/plain", b"Not Found"
+            return 200, "application/octet-stream", \
+                self.data.assets[match.group(1)]
+        if target == "/site/scratchr2/static/sa/version.xml":
+            return 200, "text/xml", \
+                b"<update><versionNumber>461</versionNumber></update>"
+        payload = self.data.route(prefix, path, parse_qs(split.query))
+        if payload is None:
+            payload = {"code": "NotFound", "message": ""}
+            return 404, "application/json", json.dumps(payload).encode()
+        return 200, "application/json", json.dumps(payload).encode()
+
+    def _record(self, target, url):
+        """Answer with what url answers, and remember it."""
+        resp = requests.get(url, timeout=30)
+        content_type = resp.headers.get("Content-Type", "application/json")
+        with self._lock:
+            self._recording[target] = {
+                "status": resp.status_code,
+                "content_type": content_type,
+                "body": base64.b64encode(resp.content).decode(),
+            }
+        return resp.status_code, content_type, resp.content
+
+def _handler(server):
+    """Make the request handler class of server."""
+    class Handler(BaseHTTPRequestHandler):
+        """Answers requests from server's data."""
+
+        protocol_version = "HTTP/1.1"
+        # Headers and body are sent apart; without this, every
+        # keep-alive response waits for a delayed ACK.
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args): # pylint: disable=arguments-differ
+            pass
+
+        def do_GET(self): # pylint: disable=invalid-name
+            """Answer a GET request."""
+            rule = server._rule(urlsplit(self.path).path) # pylint: disable=protected-access
+            if server.latency:
+                time.sleep(server.latency)
+            if rule is not None and rule.status is not None:
+                status, content_type = rule.status, "application/json"
+                phrase = self.responses.get(status, ("Error",))[0]
+                body = json.dumps({"code": phrase.replace(" ", ""),
+                                   "message": ""}).encode()
+            else:
+                status, content_type, body = server.respond(self.path)
+            content_range = None
+            etag = None
+            if status == 200:
+                etag = '"{0}"'.format(hashlib.md5(body).hexdigest())
+                if self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+            if (status == 200
+                    and self.headers.get("Range", "").startswith("bytes=")
+                    and self.headers.get("If-Range", etag) == etag):
+                start = int(self.headers["Range"][6:].split("-")[0])
+                if start >= len(body):
+                    status = 416
+                    content_range = "bytes */{0}".format(len(body))
+                    body = b""
+                else:
+                    status = 206
+                    content_range = "bytes {0}-{1}/{2}".format(
+                        start, len(body) - 1, len(body)
+                    )
+                    body = body[start:]
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if etag is not None:
+                self.send_header("ETag", etag)
+            if content_range is not None:
+                self.send_header("Content-Range", content_range)
+            if rule is not None and rule.retry_after is not None:
+                self.send_header("Retry-After", str(rule.retry_after))
+            self.end_headers()
+            self._write(body, rule.delay if rule is not None else None)
+
+        def _write(self, body, delay):
+            """Send body, spread over delay seconds if delay is set."""
+            if not delay:
+                self.wfile.write(body)
+            else:
+                pieces = 10
+                size = len(body) // pieces + 1
+                for index in range(pieces):
+                    time.sleep(delay / pieces)
+                    self.wfile.write(body[index * size:(index + 1) * size])
+                    self.wfile.flush()
+            with server._lock: # pylint: disable=protected-access
+                server.bytes_sent += len(body)
+    return Handler
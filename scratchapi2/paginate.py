@@ -0,0 +1,126 @@
+"""
+Paginator - walks every page of a listing.
+
+Listing methods like User.projects, User.following, User.favorites,
+Project.remixes, Project.comments, Studio.projects and Comment.replies
+take limit and offset and return one page. Paginator calls them again
+and again until the list runs out:
+
+    for project in Paginator(User("griffpatch").projects):
+        ...
+
+While the caller is busy with one page, the next one is requested in
+the background. paginator.offset is the offset of the next item, so a
+walk stopped early can go on later with Paginator(method, offset=...).
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# The largest limit the API accepts.
+MAX_PAGE_SIZE = 40
+
+#pylint: disable=too-many-instance-attributes
+
+class Paginator(object):
+    """Iterate every item of a listing method, page by page.
+
+    method is a bound method taking limit and offset, like
+    User("griffpatch").projects; kwargs are passed to it as well.
+    page_size is the limit of each request (at most MAX_PAGE_SIZE: the
+    API sends no more, and a shorter page would look like the last one),
+    offset where to start. If prefetch is true, page N+1 is requested
+    while page N is used.
+    """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, method, page_size=MAX_PAGE_SIZE, offset=0,
+                 prefetch=True, **kwargs):
+        """Initialize the paginator. Nothing is requested yet."""
+        self.method = method
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.offset = offset
+        self.prefetch = prefetch
+        self.kwargs = kwargs
+        self._next_offset = offset
+        self._page = deque()
+        self._future = None
+        self._done = False
+
+    def __repr__(self):
+        """Represent the paginator."""
+        return "<Paginator {0} offset={1}>".format(
+            getattr(self.method, "__name__", self.method), self.offset
+        )
+
+    __str__ = __repr__
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._page:
+            if self._done:
+                raise StopIteration
+            self._advance()
+        self.offset += 1
+        return self._page.popleft()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _prefetch_pool():
+        """Return the thread pool shared by every paginator."""
+        if Paginator._pool is None:
+            with Paginator._pool_lock:
+                if Paginator._pool is None:
+                    Paginator._pool = ThreadPoolExecutor(max_workers=8)
+        return Paginator._pool
+
+    def _fetch(self, offset):
+        """Request one page."""
+        return list(self.method(limit=self.page_size, offset=offset,
+                                **self.kwargs))
+
+    def _advance(self):
+        """Take the next page, and start requesting the one after it."""
+        if self._future is not None:
+            future, self._future = self._future, None
+            page = future.result()
+        else:
+            page = self._fetch(self._next_offset)
+        self._next_offset += len(page)
+        if len(page) < self.page_size:
+            self._done = True
+        elif self.prefetch:
+            self._future = self._prefetch_pool().submit(self._fetch,
+                                                        self._next_offset)
+        self._page.extend(page)
+
+    def pages(self):
+        """Yield the remaining items a page (list) at a time."""
+        while True:
+            if self._page:
+                page = list(self._page)
+                self._page.clear()
+            elif self._done:
+                return
+            else:
+                self._advance()
+                continue
+            self.offset += len(page)
+            yield page
+
+    def close(self):
+        """Stop walking. The prefetched page, if any, is dropped."""
+        self._done = True
+        self._page.clear()
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
@@ -0,0 +1,209 @@
+"""
+RateLimiter and RetryPolicy - keep crawlers under the API's limits.
+
+Use them by giving them to a Transport:
+    Transport(limiter=RateLimiter(rate=10),
+              retry=RetryPolicy(retries=5)).install()
+
+class RateLimiter (a token bucket per host, shared by every thread)
+- reserve()
+- acquire()
+- pause()
+- stats()
+class RetryPolicy (exponential backoff with jitter, and Retry-After)
+- should_retry()
+- delay()
+- stats()
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from .gclass import GenericData
+
+#pylint: disable=too-many-instance-attributes
+
+class _Bucket(object):
+    """The tokens of one host."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "paused_until")
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+class RateLimiter(object):
+    """Lets at most rate requests a second through to each host, with
+    bursts of up to burst requests (by default, one second's worth).
+    host_rates gives some hosts their own budget, as a rate or a
+    (rate, burst) pair, like:
+    RateLimiter(rate=5, host_rates={"api.scratch.mit.edu": (20, 40)})
+    """
+
+    def __init__(self, rate=10, burst=None, host_rates=None):
+        """Initialize the limiter with full buckets."""
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.pauses = 0
+
+    def __repr__(self):
+        """Represent the limiter."""
+        return "<RateLimiter rate={0}>".format(self.rate)
+
+    __str__ = __repr__
+
+    def _bucket(self, host):
+        """Return the bucket of host, making it if needed."""
+        if host not in self._buckets:
+            rate = self.host_rates.get(host, self.rate)
+            if isinstance(rate, tuple):
+                rate, burst = rate
+            else:
+                burst = self.burst or rate
+            self._buckets[host] = _Bucket(rate, max(burst, 1))
+        return self._buckets[host]
+
+    def reserve(self, url):
+        """Take a token for url's host, and return how many seconds to
+        wait before sending the request. Requests reserved together are
+        spaced out, in the order they were reserved.
+        """
+        with self._lock:
+            bucket = self._bucket(urlsplit(url).hostname)
+            now = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens
+                                + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+            wait = max(-bucket.tokens / bucket.rate,
+                       bucket.paused_until - now, 0.0)
+            self.requests += 1
+            if wait:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    def acquire(self, url):
+        """Wait until a request to url may be sent. Returns the seconds
+        waited.
+        """
+        wait = self.reserve(url)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, url, seconds):
+        """Hold every request to url's host for seconds, like when the
+        host answered 429 Too Many Requests.
+        """
+        with self._lock:
+            bucket = self._bucket(urlsplit(url).hostname)
+            bucket.paused_until = max(bucket.paused_until,
+                                      time.monotonic() + seconds)
+            self.pauses += 1
+
+    def stats(self):
+        """Return how many requests went through and how long they were
+        held back.
+        """
+        return GenericData(
+            requests=self.requests,
+            throttled=self.throttled,
+            waited=self.waited,
+            pauses=self.pauses,
+            _repr_str="<RateLimiterStats requests={requests} "
+                      "throttled={throttled} waited={waited:.2f}s>"
+        )
+
+class RetryPolicy(object):
+    """Retries requests failing with one of statuses (or not answered at
+    all) up to retries times. The n-th retry waits a random time up to
+    backoff * 2 ** n seconds, or what the response's Retry-After header
+    says; at most max_backoff either way.
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30,
+                 statuses=(429, 500, 502, 503, 504)):
+        """Initialize the policy."""
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self._lock = threading.Lock()
+        self.retried = 0
+        self.gave_up = 0
+        self.slept = 0.0
+
+    def __repr__(self):
+        """Represent the policy."""
+        return "<RetryPolicy retries={0}>".format(self.retries)
+
+    __str__ = __repr__
+
+    def should_retry(self, attempt, status=None):
+        """Tell if the attempt-th try (from 0), answered with the HTTP
+        status (None if it was not answered), should be tried again.
+        """
+        if status is not None and status not in self.statuses:
+            return False
+        if attempt >= self.retries:
+            with self._lock:
+                self.gave_up += 1
+            return False
+        return True
+
+    def delay(self, attempt, retry_after=None):
+        """Return how many seconds to wait before retrying the
+        attempt-th try, and count the retry. retry_after is the
+        Retry-After header of the answer, if any.
+        """
+        wait = _retry_after(retry_after)
+        if wait is None:
+            wait = random.uniform(0, min(self.max_backoff,
+                                         self.backoff * 2 ** attempt))
+        else:
+            wait = min(wait, self.max_backoff)
+        with self._lock:
+            self.retried += 1
+            self.slept += wait
+        return wait
+
+    def stats(self):
+        """Return how many retries were made and how long they waited."""
+        return GenericData(
+            retried=self.retried,
+            gave_up=self.gave_up,
+            slept=self.slept,
+            _repr_str="<RetryStats retried={retried} gave_up={gave_up} "
+                      "slept={slept:.2f}s>"
+        )
+
+def _retry_after(value):
+    """Return the seconds a Retry-After header (in seconds or as a
+    date) asks to wait, or None.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        # "-0000" means UTC, but gives a naive datetime.
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,136 @@
+"""
+RemixTree - walks the remix tree under a project, breadth first.
+
+The remixes pages are requested concurrently, but only workers of them
+are in flight at once, and the queue of projects still to expand holds
+just (ID, depth, offset) tuples, so trees of tens of thousands of
+projects can be walked. Edges are yielded as they come:
+
+    tree = RemixTree(104, max_depth=3)
+    for edge in tree.edges():
+        save(edge.parent.projectid, edge.child.projectid, edge.depth)
+
+tree.checkpoint() can be taken between two edges (it is a plain dict,
+ready for json.dump), and RemixTree.from_checkpoint() goes on from it
+without yielding an edge twice. Going up is Project.ancestors().
+"""
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from .user import Project, _request
+from .paginate import MAX_PAGE_SIZE
+
+#pylint: disable=too-many-instance-attributes
+
+RemixEdge = namedtuple("RemixEdge", "parent child depth")
+
+class RemixTree(object):
+    """The remixes of root (a Project or project ID), their remixes,
+    and so on. The walk stops below max_depth (1 is the direct remixes
+    only) or after max_nodes remixes; None means no limit.
+    """
+
+    def __init__(self, root, max_depth=None, max_nodes=None, workers=8,
+                 page_size=MAX_PAGE_SIZE):
+        """Initialize the walk. Nothing is requested yet."""
+        self.root = root if isinstance(root, Project) else Project(root)
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.workers = workers
+        self.page_size = page_size
+        self.nodes = 0
+        # (project ID, depth, offset) of the pages not walked yet; the
+        # first one is being yielded, and _done of its items were.
+        self._queue = deque([(self.root.projectid, 0, 0)])
+        self._done = 0
+
+    def __repr__(self):
+        """Represent the walk."""
+        return "<RemixTree {0} ({1} remixes)>".format(self.root.projectid,
+                                                      self.nodes)
+
+    __str__ = __repr__
+
+    def __iter__(self):
+        return self.edges()
+
+    def _page(self, task):
+        projectid, _, offset = task
+        return _request("projects/{0}/remixes?limit={1}&offset={2}",
+                        projectid, self.page_size, offset)
+
+    def _expand(self, item, depth):
+        """Tell if the remix item, at depth, should have its remixes
+        requested.
+        """
+        if self.max_depth is not None and depth >= self.max_depth:
+            return False
+        return item.get("stats", {}).get("remixes", 1) != 0
+
+    def edges(self):
+        """Yield a RemixEdge(parent, child, depth) for every remix, level
+        by level.
+        """
+        # The first len(futures) tasks of the queue are being requested.
+        futures = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while self._queue and not self._full():
+                    while len(futures) < min(self.workers, len(self._queue)):
+                        futures.append(pool.submit(self._page,
+                                                   self._queue[len(futures)]))
+                    yield from self._edges(self._queue[0],
+                                           futures.popleft().result())
+                    if self._full():
+                        break
+                    self._queue.popleft()
+                    self._done = 0
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _full(self):
+        return self.max_nodes is not None and self.nodes >= self.max_nodes
+
+    def _edges(self, task, page):
+        """Yield the edges of one page, skipping those already yielded
+        (when going on from a checkpoint).
+        """
+        projectid, depth, offset = task
+        parent = Project(projectid)
+        if not self._done and len(page) >= self.page_size:
+            self._queue.append((projectid, depth, offset + self.page_size))
+        for item in page[self._done:]:
+            if self._full():
+                return
+            child = Project.from_json(item)
+            if self._expand(item, depth + 1):
+                self._queue.append((child.projectid, depth + 1, 0))
+            self.nodes += 1
+            self._done += 1
+            yield RemixEdge(parent, child, depth + 1)
+
+    def checkpoint(self):
+        """Return where the walk is, as a dict of plain values."""
+        return {
+            "root": self.root.projectid,
+            "max_depth": self.max_depth,
+            "max_nodes": self.max_nodes,
+            "page_size": self.page_size,
+            "nodes": self.nodes,
+            "done": self._done,
+            "queue": [list(task) for task in self._queue],
+        }
+
+    @classmethod
+    def from_checkpoint(cls, state, **kwargs):
+        """Make a walk going on from checkpoint(). kwargs are passed to
+        RemixTree(), like workers, or a larger max_nodes.
+        """
+        kwargs.setdefault("max_depth", state["max_depth"])
+        kwargs.setdefault("max_nodes", state["max_nodes"])
+        kwargs.setdefault("page_size", state["page_size"])
+        tree = cls(state["root"], **kwargs)
+        tree.nodes = state["nodes"]
+        tree._done = state["done"]
+        tree._queue = deque(tuple(task) for task in state["queue"])
+        return tree
@@ -0,0 +1,404 @@
+"""
+FollowGraph - walks who follows whom, breadth first, from seed users.
+
+Every edge is written to a file as it is found, one per line:
+"<follower>\\t<followed>". Users are de-duplicated with a BitSet of their
+user IDs (one bit each, so every Scratch user fits in a few tens of
+megabytes), and only workers pages are requested at once:
+
+    graph = FollowGraph(["griffpatch"], "edges.tsv", max_depth=2,
+                        checkpoint="crawl.json")
+    graph.crawl()                   # the number of edges written
+
+The pages still to walk are not kept in memory but appended to a file
+(checkpoint + ".queue", or a temporary file), and read from the front.
+Every checkpoint_every pages, where the walk is is saved to checkpoint,
+and the BitSets next to it, in a file named after the checkpoint's
+generation; the checkpoint is replaced last, so a crash in between
+leaves the one before whole. After a crash,
+FollowGraph.resume("crawl.json") goes on from there; the edges written
+after the checkpoint are dropped from the file and found again. Once the
+walk is over, the queue and the BitSets are removed, and the checkpoint
+says it is done.
+
+An edge between two users whose lists are both walked is written once,
+from the follower's side, when both directions are walked.
+"""
+import json
+import os
+import tempfile
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from .paginate import MAX_PAGE_SIZE
+from .user import User, _request
+
+#pylint: disable=too-many-instance-attributes
+
+FollowEdge = namedtuple("FollowEdge", "follower followed depth")
+
+class BitSet(object):
+    """A set of non-negative integers (like user IDs), one bit each."""
+
+    def __init__(self, data=b""):
+        """Initialize the set, from the bytes of another one if given."""
+        self._bits = bytearray(data)
+        self._count = sum(bin(byte).count("1") for byte in self._bits)
+
+    def __repr__(self):
+        """Represent the set."""
+        return "<BitSet ({0} items)>".format(self._count)
+
+    __str__ = __repr__
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, number):
+        index = number >> 3
+        return (index < len(self._bits)
+                and bool(self._bits[index] & (1 << (number & 7))))
+
+    def add(self, number):
+        """Add number. Returns whether it was not in the set yet."""
+        index = number >> 3
+        if index >= len(self._bits):
+            # Grow by at least half, not a byte at a time.
+            self._bits.extend(bytes(max(index + 1 - len(self._bits),
+                                        len(self._bits) // 2)))
+        mask = 1 << (number & 7)
+        if self._bits[index] & mask:
+            return False
+        self._bits[index] |= mask
+        self._count += 1
+        return True
+
+    def to_bytes(self):
+        """Return the set as bytes, for BitSet(data)."""
+        return bytes(self._bits)
+
+class _TaskLog(object):
+    """The pages still to walk, (username, depth, direction, offset)
+    tasks appended to a file and read from its front. start and end are
+    the offsets of the first task not read and of the end.
+    """
+
+    def __init__(self, path=None, start=0, end=0):
+        """Open the log at path (a temporary file if None), cutting
+        off what is past end.
+        """
+        if path is None:
+            self._file = tempfile.TemporaryFile()
+        else:
+            self._file = open(path, "r+b" if os.path.exists(path) else "w+b") # pylint: disable=consider-using-with
+            self._file.truncate(end)
+        self.start = start
+        self.end = end
+
+    def append(self, tasks):
+        """Add tasks at the end."""
+        data = "".join("{0}\t{1}\t{2}\t{3}\n".format(*task)
+                       for task in tasks).encode()
+        if data:
+            self._file.seek(self.end)
+            self._file.write(data)
+            self.end += len(data)
+
+    def pop(self):
+        """Read the first task, and return its offset and the task; None
+        if every task was read.
+        """
+        if self.start >= self.end:
+            return None
+        self._file.seek(self.start)
+        line = self._file.readline()
+        offset, self.start = self.start, self.start + len(line)
+        username, depth, direction, page = line.decode().split("\t")
+        return offset, (username, int(depth), direction, int(page))
+
+    def sync(self):
+        """Write the tasks to the disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+class FollowGraph(object):
+    """The users seeds (usernames) follow and are followed by, and so on.
+
+    directions are the lists walked: "following", "followers" or both.
+    The walk stops below max_depth (1: the seeds' lists only) and takes
+    in at most max_users users; None means no limit. Edges are written
+    to output (a filename).
+    """
+
+    def __init__(self, seeds, output, directions=("following", "followers"),
+                 max_depth=None, max_users=None, workers=8,
+                 page_size=MAX_PAGE_SIZE, checkpoint=None,
+                 checkpoint_every=100):
+        """Initialize the walk. Nothing is requested yet."""
+        self.seeds = list(seeds)
+        self.output = output
+        self.directions = tuple(directions)
+        self.max_depth = max_depth
+        self.max_users = max_users
+        self.workers = workers
+        self.page_size = page_size
+        self.checkpoint_path = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.edges_written = 0
+        self.pages = 0
+        self.visited = BitSet()
+        # The visited users whose lists are walked (not too deep); only
+        # kept if both directions are, to write each edge once.
+        self.walked = BitSet()
+        self._both = {"following", "followers"} <= set(self.directions)
+        self.generation = 0
+        self.done = False
+        self._log = None
+        # (start, end) of the task log while it is closed.
+        self._queue = None
+        # (offset in the log, task, future) of the pages requested.
+        self._in_flight = deque()
+        self._output_size = 0
+        self._bits = None
+        self._visited_size = 0
+
+    def __repr__(self):
+        """Represent the walk."""
+        return "<FollowGraph ({0} users, {1} edges)>".format(
+            len(self.visited), self.edges_written
+        )
+
+    __str__ = __repr__
+
+    def __iter__(self):
+        return self.edges()
+
+    def _visit(self, username, userid, depth):
+        """Take in a user found at depth. Returns the tasks of its lists
+        if it is new and not too deep.
+        """
+        if self.max_users is not None and len(self.visited) >= self.max_users:
+            return ()
+        if not self.visited.add(userid):
+            return ()
+        if self.max_depth is not None and depth >= self.max_depth:
+            return ()
+        if self._both:
+            self.walked.add(userid)
+        return [(username, depth, direction, 0)
+                for direction in self.directions]
+
+    def _page(self, task):
+        username, _, direction, offset = task
+        return _request("users/{0}/{1}?limit={2}&offset={3}",
+                        username, direction, self.page_size, offset)
+
+    def _open_log(self):
+        """Open the task log: the one closed before, or a new one with
+        the seeds in it. Returns whether it is new.
+        """
+        path = (self.checkpoint_path + ".queue"
+                if self.checkpoint_path is not None else None)
+        if self._queue is not None:
+            if path is None:
+                raise ValueError("The walk was stopped, and without a "
+                                 "checkpoint it cannot go on")
+            self._log = _TaskLog(path, *self._queue)
+            return False
+        self._log = _TaskLog(path)
+        for username in self.seeds:
+            self._log.append(self._visit(username, User(username).userid, 0))
+        return True
+
+    def edges(self):
+        """Yield a FollowEdge for every edge, as it is written. If it is
+        stopped early, calling it again goes on (with a checkpoint).
+        """
+        if self.done:
+            return
+        mode = "w" if self._open_log() else "a"
+        try:
+            with open(self.output, mode, encoding="utf-8") as out:
+                yield from self._walk(out)
+                self.done = True
+                self._close_log()
+                if self.checkpoint_path is not None:
+                    self._finish(out)
+        finally:
+            self._close_log()
+
+    def _close_log(self):
+        """Close the task log, if it is open, keeping where it was."""
+        if self._log is not None:
+            self._queue = (self._log.start, self._log.end)
+            self._log.close()
+            self._log = None
+
+    def _walk(self, out):
+        """Request the pages of the task log, and write and yield their
+        edges, until it is empty.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while True:
+                    while len(self._in_flight) < self.workers:
+                        item = self._log.pop()
+                        if item is None:
+                            break
+                        offset, task = item
+                        self._in_flight.append(
+                            (offset, task, pool.submit(self._page, task))
+                        )
+                    if not self._in_flight:
+                        return
+                    _, task, future = self._in_flight.popleft()
+                    yield from self._edges(task, future.result(), out)
+                    self.pages += 1
+                    if (self.checkpoint_path is not None
+                            and self.pages % self.checkpoint_every == 0):
+                        self.save_checkpoint(out)
+            finally:
+                # Requested again if edges() is called again.
+                for _, _, future in self._in_flight:
+                    future.cancel()
+                if self._in_flight:
+                    self._log.start = self._in_flight[0][0]
+                    self._in_flight.clear()
+
+    def _edges(self, task, page, out):
+        """Write and yield the edges of one page."""
+        username, depth, direction, offset = task
+        tasks = []
+        if len(page) >= self.page_size:
+            tasks.append((username, depth, direction, offset + self.page_size))
+        edges = []
+        for item in page:
+            tasks.extend(self._visit(item["username"], item["id"], depth + 1))
+            if direction == "following":
+                edges.append(FollowEdge(username, item["username"], depth + 1))
+            elif not self._both or item["id"] not in self.walked:
+                # Else the follower's own list has (or will have) it.
+                edges.append(FollowEdge(item["username"], username, depth + 1))
+        self._log.append(tasks)
+        for edge in edges:
+            out.write("{0}\t{1}\n".format(edge.follower, edge.followed))
+            self.edges_written += 1
+            yield edge
+
+    def crawl(self):
+        """Walk to the end, and return the number of edges written."""
+        for _ in self.edges():
+            pass
+        return self.edges_written
+
+    def checkpoint(self):
+        """Return where the walk is, as a dict of plain values (the
+        BitSets are in the file named by "bits").
+        """
+        queue = None
+        if self._log is not None:
+            start = (self._in_flight[0][0] if self._in_flight
+                     else self._log.start)
+            queue = {"start": start, "end": self._log.end}
+        elif self._queue is not None and not self.done:
+            queue = {"start": self._queue[0], "end": self._queue[1]}
+        return {
+            "seeds": self.seeds,
+            "output": self.output,
+            "output_size": self._output_size,
+            "directions": list(self.directions),
+            "max_depth": self.max_depth,
+            "max_users": self.max_users,
+            "page_size": self.page_size,
+            "edges": self.edges_written,
+            "pages": self.pages,
+            "generation": self.generation,
+            "done": self.done,
+            "bits": self._bits,
+            "visited_size": self._visited_size,
+            "queue": queue,
+        }
+
+    def save_checkpoint(self, out=None):
+        """Flush out (the output file) and the task log, then save the
+        BitSets to a new file and checkpoint() over the old one.
+        """
+        self._sync_output(out)
+        if self._log is not None:
+            self._log.sync()
+        old_bits = self._bits
+        self.generation += 1
+        self._bits = "{0}.bits.{1}".format(
+            os.path.basename(self.checkpoint_path), self.generation
+        )
+        bits_path = os.path.join(os.path.dirname(self.checkpoint_path),
+                                 self._bits)
+        with open(bits_path, "wb") as fileobj:
+            self._visited_size = fileobj.write(self.visited.to_bytes())
+            fileobj.write(self.walked.to_bytes())
+            fileobj.flush()
+            os.fsync(fileobj.fileno())
+        self._write_checkpoint(json.dumps(self.checkpoint()).encode())
+        if old_bits is not None:
+            os.remove(os.path.join(os.path.dirname(self.checkpoint_path),
+                                   old_bits))
+
+    def _sync_output(self, out):
+        """Write out (the output file, if given) to the disk."""
+        if out is not None:
+            out.flush()
+            os.fsync(out.fileno())
+            self._output_size = out.tell()
+
+    def _finish(self, out):
+        """Save a checkpoint saying the walk is done, then remove the task
+        log and the BitSets.
+        """
+        self._sync_output(out)
+        old_bits, self._bits = self._bits, None
+        self._write_checkpoint(json.dumps(self.checkpoint()).encode())
+        os.remove(self.checkpoint_path + ".queue")
+        if old_bits is not None:
+            os.remove(os.path.join(os.path.dirname(self.checkpoint_path),
+                                   old_bits))
+
+    def _write_checkpoint(self, data):
+        """Replace the checkpoint file with data, at once."""
+        with open(self.checkpoint_path + ".tmp", "wb") as fileobj:
+            fileobj.write(data)
+            fileobj.flush()
+            os.fsync(fileobj.fileno())
+        os.replace(self.checkpoint_path + ".tmp", self.checkpoint_path)
+
+    @classmethod
+    def resume(cls, checkpoint, **kwargs):
+        """Make a walk going on from the checkpoint saved at checkpoint.
+        kwargs are passed to FollowGraph(), like workers.
+        """
+        with open(checkpoint, encoding="utf-8") as fileobj:
+            state = json.load(fileobj)
+        for key in ("directions", "max_depth", "max_users", "page_size"):
+            kwargs.setdefault(key, state[key])
+        graph = cls(state["seeds"], state["output"], checkpoint=checkpoint,
+                    **kwargs)
+        graph.edges_written = state["edges"]
+        graph.pages = state["pages"]
+        graph.generation = state["generation"]
+        graph.done = state.get("done", False)
+        if state["queue"] is not None:
+            graph._queue = (state["queue"]["start"], state["queue"]["end"])
+            graph._bits = state["bits"]
+            graph._visited_size = state["visited_size"]
+            with open(os.path.join(os.path.dirname(checkpoint), state["bits"]),
+                      "rb") as fileobj:
+                data = fileobj.read()
+            graph.visited = BitSet(data[:state["visited_size"]])
+            graph.walked = BitSet(data[state["visited_size"]:])
+        graph._output_size = state["output_size"]
+        if os.path.exists(graph.output):
+            # Drop what was written after the checkpoint.
+            os.truncate(graph.output, graph._output_size)
+        return graph
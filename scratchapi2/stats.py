@@ -0,0 +1,231 @@
+"""
+Statistics - the monthly statistics as compact time series.
+
+statistics/data/monthly/ is downloaded once and kept for ttl seconds.
+Every series is two arrays: timestamps (seconds since the epoch) and
+values, both array('d'). If NumPy is installed, Series.to_numpy() gives
+them as NumPy arrays, and rolling sums and ratios are computed with it.
+
+    stats = Statistics()
+    new = stats.series(StatisticsType.project, StatisticsType.new)
+    remix = stats.series(StatisticsType.project, StatisticsType.remix)
+    (remix / new).resample("year")
+
+class Statistics
+- document()
+- series()
+- all_series()
+- ages()
+- countries()
+class Series
+"""
+import math
+import threading
+import time
+from array import array
+from datetime import datetime
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from .api import APIClass
+from .excs import ScratchAPIError
+
+# (statistics type, kind or place) -> (key in the document, index)
+SERIES = {
+    ("comment", "project"): ("comment_data", 0),
+    ("comment", "studio"): ("comment_data", 1),
+    ("comment", "profile"): ("comment_data", 2),
+    ("activity", "project"): ("activity_data", 0),
+    ("activity", "user"): ("activity_data", 1),
+    ("activity", "comment"): ("activity_data", 2),
+    ("active_user", "project"): ("active_user_data", 0),
+    ("active_user", "comment"): ("active_user_data", 1),
+    ("project", "new"): ("project_data", 0),
+    ("project", "remix"): ("project_data", 1),
+}
+
+def _bucket(timestamp, period):
+    """Return the start of the period timestamp falls in."""
+    if not isinstance(period, str):
+        return timestamp - timestamp % period
+    date = datetime.utcfromtimestamp(timestamp)
+    if period == "year":
+        date = date.replace(month=1)
+    elif period == "quarter":
+        date = date.replace(month=(date.month - 1) // 3 * 3 + 1)
+    elif period != "month":
+        raise ValueError("Unknown period: {0}".format(period))
+    start = date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (start - datetime(1970, 1, 1)).total_seconds()
+
+class Series(object):
+    """A time series: timestamps (seconds) and values, as array('d')."""
+
+    def __init__(self, name, timestamps, values):
+        """Initialize a series from two sequences of the same length."""
+        self.name = name
+        self.timestamps = array('d', timestamps)
+        self.values = array('d', values)
+
+    def __repr__(self):
+        """Represent a series."""
+        return "<Series {0} ({1} points)>".format(self.name, len(self))
+
+    __str__ = __repr__
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        """Yield (datetime, value) pairs."""
+        for timestamp, value in zip(self.timestamps, self.values):
+            yield datetime.utcfromtimestamp(timestamp), value
+
+    def __truediv__(self, other):
+        return self.ratio(other)
+
+    def to_numpy(self):
+        """Return (timestamps, values) as NumPy arrays. Requires NumPy."""
+        if numpy is None:
+            raise ImportError("Series.to_numpy() requires NumPy.")
+        return (numpy.frombuffer(self.timestamps, dtype=numpy.float64),
+                numpy.frombuffer(self.values, dtype=numpy.float64))
+
+    def resample(self, period, how=sum):
+        """Group the points by period ("month", "quarter", "year", or a
+        number of seconds) and combine each group with how (sum by
+        default; max, min or statistics.mean work too).
+        """
+        timestamps = array('d')
+        values = array('d')
+        group = []
+        current = None
+        for timestamp, value in zip(self.timestamps, self.values):
+            start = _bucket(timestamp, period)
+            if start != current and group:
+                timestamps.append(current)
+                values.append(how(group))
+                group = []
+            current = start
+            group.append(value)
+        if group:
+            timestamps.append(current)
+            values.append(how(group))
+        return Series("{0} by {1}".format(self.name, period),
+                      timestamps, values)
+
+    def rolling_sum(self, window):
+        """Return the sums of every window points. The first window - 1
+        points, which have no full window, are dropped.
+        """
+        if numpy is not None:
+            cumsum = numpy.cumsum(self.to_numpy()[1])
+            sums = cumsum[window - 1:].copy()
+            sums[1:] -= cumsum[:-window]
+            return Series("{0} rolling {1}".format(self.name, window),
+                          self.timestamps[window - 1:], sums.tolist())
+        sums = array('d')
+        total = 0.0
+        for index, value in enumerate(self.values):
+            total += value
+            if index >= window:
+                total -= self.values[index - window]
+            if index >= window - 1:
+                sums.append(total)
+        return Series("{0} rolling {1}".format(self.name, window),
+                      self.timestamps[window - 1:], sums)
+
+    def ratio(self, other):
+        """Divide by other, point by point, on the timestamps both have.
+        Dividing by 0 gives NaN.
+        """
+        if self.timestamps == other.timestamps:
+            timestamps = self.timestamps
+            mine, theirs = self.values, other.values
+        else:
+            index = {timestamp: i for i, timestamp in enumerate(other.timestamps)}
+            pairs = [(timestamp, value, other.values[index[timestamp]])
+                     for timestamp, value in zip(self.timestamps, self.values)
+                     if timestamp in index]
+            timestamps = [pair[0] for pair in pairs]
+            mine = array('d', [pair[1] for pair in pairs])
+            theirs = array('d', [pair[2] for pair in pairs])
+        name = "{0} / {1}".format(self.name, other.name)
+        if numpy is not None:
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                values = (numpy.frombuffer(mine, dtype=numpy.float64)
+                          / numpy.frombuffer(theirs, dtype=numpy.float64))
+            values[~numpy.isfinite(values)] = math.nan
+            return Series(name, timestamps, values.tolist())
+        return Series(name, timestamps,
+                      [a / b if b else math.nan for a, b in zip(mine, theirs)])
+
+class Statistics(APIClass):
+    """The monthly statistics of Scratch, downloaded once per ttl
+    seconds. See Misc.statistics() for the types, kinds and places.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, ttl=3600, api_url="https://scratch.mit.edu/"):
+        """Initialize the engine. Nothing is downloaded yet."""
+        super().__init__(api_url)
+        self.ttl = ttl
+        self._document = None
+        self._fetched = 0
+        self._lock = threading.Lock()
+
+    def document(self, max_age=None):
+        """Return the monthly statistics document, downloading it again
+        if it is older than max_age (by default, ttl) seconds.
+        """
+        if max_age is None:
+            max_age = self.ttl
+        with self._lock:
+            if self._document is None or time.time() - self._fetched >= max_age:
+                self._document = self._request('statistics/data/monthly/')
+                self._fetched = time.time()
+            return self._document
+
+    def refresh(self):
+        """Download the document again now."""
+        return self.document(max_age=0)
+
+    def series(self, statistics_type, kind):
+        """Return one series, like series(StatisticsType.activity,
+        StatisticsType.user). kind is the place for comments.
+        """
+        if (statistics_type, kind) not in SERIES:
+            raise ScratchAPIError("Unknown series: {0} {1}".format(
+                statistics_type, kind
+            ))
+        key, index = SERIES[statistics_type, kind]
+        points = self.document()[key][index]["values"]
+        return Series("{0} {1}".format(statistics_type, kind),
+                      [point["x"] / 1000 for point in points],
+                      [point["y"] for point in points])
+
+    def all_series(self):
+        """Return every series, as a dict keyed like SERIES."""
+        return {name: self.series(*name) for name in SERIES}
+
+    def ages(self):
+        """Return the age distribution, as (ages, counts) arrays."""
+        points = self.document()["age_distribution_data"][0]["values"]
+        return (array('d', [point["x"] for point in points]),
+                array('d', [point["y"] for point in points]))
+
+    def countries(self):
+        """Return the number of users of every country."""
+        return self.document()["country_distribution"]
+
+    @classmethod
+    def default(cls):
+        """Return the engine shared by Misc.statistics()."""
+        if Statistics._default is None:
+            with Statistics._default_lock:
+                if Statistics._default is None:
+                    Statistics._default = cls()
+        return Statistics._default
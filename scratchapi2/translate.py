@@ -4,15 +4,114 @@ class Translate
 - translate_status()
 - languages()
 - translate()
+- translate_many()
+class TranslationMemo (remembers translations, optionally on disk)
 """
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote as urlencode
 from .api import APISingleton
+from .excs import FetchError
+
+class TranslationMemo(object):
+    """Remembers up to maxsize translations, keyed by (locale, text),
+    dropping the least recently used. If path is given, every
+    translation is also kept in an SQLite database there, so a later
+    run only translates strings it has not seen.
+    """
+
+    def __init__(self, maxsize=100000, path=None):
+        """Initialize an empty memo (or open the one at path)."""
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    "locale TEXT, text TEXT, result TEXT, "
+                    "PRIMARY KEY (locale, text))"
+                )
+
+    def __repr__(self):
+        """Represent the memo."""
+        return "<TranslationMemo ({0} in memory)>".format(len(self))
+
+    __str__ = __repr__
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, locale, text):
+        """Return the translation of text into locale, or None."""
+        key = (locale, text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT result FROM translations WHERE locale = ? AND text = ?",
+                key
+            ).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row[0])
+        return row[0]
+
+    def set(self, locale, text, result):
+        """Remember the translation of text into locale."""
+        self._remember((locale, text), result)
+        if self._db is not None:
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+                    (locale, text, result)
+                )
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every translation, on disk too."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM translations")
+
+    def close(self):
+        """Close the database, if any."""
+        if self._db is not None:
+            self._db.close()
 
 class Translate(APISingleton):
-    """Represents the Translate API."""
+    """Represents the Translate API.
+
+    Translations are remembered in memo (a TranslationMemo), and the
+    supported languages once per locale.
+    """
 
-    def __init__(self, api_url="https://translate-service.scratch.mit.edu/"):
-        """Initialize the object with the API URL."""
+    def __init__(self, api_url="https://translate-service.scratch.mit.edu/",
+                 memo=None):
+        """Initialize the object with the API URL. As Translate is a
+        singleton, the memo is only replaced if one is given.
+        """
         super().__init__(api_url)
+        if memo is not None or not hasattr(self, "memo"):
+            self.memo = memo if memo is not None else TranslationMemo()
+        if not hasattr(self, "_languages"):
+            self._languages = {}
 
     def translate_status(self):
         """Check the status of the API."""
@@ -23,10 +122,43 @@ class Translate(APISingleton):
             return False
 
     def languages(self, locale="en"):
-        """Return available langauges."""
-        return self._request('supported?language={}', locale)
+        """Return available langauges. They are only requested once for
+        each locale.
+        """
+        if locale not in self._languages:
+            self._languages[locale] = self._request('supported?language={}',
+                                                    locale)
+        return self._languages[locale]
 
     def translate(self, locale="ja", text="Hello"):
         """Translate text."""
-        return self._request('translate?language={0}&text={1}',
-                             locale, text)['result']
+        result = self.memo.get(locale, text)
+        if result is None:
+            result = self._request('translate?language={0}&text={1}',
+                                   locale, urlencode(text))['result']
+            self.memo.set(locale, text, result)
+        return result
+
+    def translate_many(self, pairs, workers=8):
+        """Translate every (locale, text) pair of pairs, up to workers at
+        once, and return the translations as a dict keyed by the pairs.
+        Only the pairs not in the memo are requested. If one fails, a
+        FetchError is put in its place and the rest are still translated.
+        """
+        results = {}
+        missing = []
+        for pair in pairs:
+            if pair in results:
+                continue
+            results[pair] = self.memo.get(*pair)
+            if results[pair] is None:
+                missing.append(pair)
+        def translate(pair):
+            try:
+                return self.translate(*pair)
+            except Exception as exc: # pylint: disable=broad-except
+                return FetchError(pair, exc)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for pair, result in zip(missing, pool.map(translate, missing)):
+                results[pair] = result
+        return results
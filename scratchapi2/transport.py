@@ -0,0 +1,225 @@
+"""
+Transport - the HTTP layer every request goes through.
+
+It keeps one pooled, keep-alive requests.Session, so the TCP and TLS
+handshakes are made once per connection instead of once per lookup.
+
+class Transport (use Transport.default() to get the shared one)
+- base_urls (sends requests somewhere else, like a MockServer)
+- get()
+- get_json() (identical lookups made at once share one request)
+- flights (the SingleFlight counting them)
+- loads (the JSON decoder; see scratchapi2.jsondecode)
+- instruments (hooks around every request; see scratchapi2.instrument)
+- identities (the IdentityMap of the models made through it)
+- install()
+- close()
+"""
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from .identity import IdentityMap
+from .coalesce import SingleFlight
+from .jsondecode import get_decoder
+from .instrument import Instruments, RequestEvent
+
+#pylint: disable=too-many-instance-attributes
+
+HOSTS = (
+    "api.scratch.mit.edu",
+    "projects.scratch.mit.edu",
+    "scratch.mit.edu",
+    "translate-service.scratch.mit.edu",
+    "cdn.assets.scratch.mit.edu",
+)
+
+def rewrite_url(url, base_urls):
+    """Replace the start of url if it is one of base_urls' keys."""
+    for base, replacement in base_urls.items():
+        if url.startswith(base):
+            return replacement + url[len(base):]
+    return url
+
+class Transport(object):
+    """A pooled, keep-alive HTTP transport shared by every API call.
+
+    pool_size is the number of connections kept open per host.
+    host_pool_sizes overrides it for some hosts, like:
+    Transport(host_pool_sizes={"api.scratch.mit.edu": 50})
+    cache is a Cache keeping responses, or None.
+    limiter is a RateLimiter every request waits for, or None.
+    retry is a RetryPolicy for failed requests, or None (no retries).
+    base_urls maps URL prefixes to the ones to use instead, like
+    {"https://api.scratch.mit.edu/": "http://127.0.0.1:8000/api/"}.
+    instruments is an Instruments to share with another transport; by
+    default, the transport has its own, without hooks.
+    If coalesce is true, get_json() calls for the same URL made while
+    one is in flight wait for it instead of sending their own.
+    decoder decodes the JSON bodies: "orjson", "ujson", "json", a
+    function taking bytes, or None for the fastest installed.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, pool_size=10, host_pool_sizes=None, timeout=30,
+                 cache=None, limiter=None, retry=None, base_urls=None,
+                 instruments=None, coalesce=True, decoder=None):
+        """Initialize the transport and its connection pools."""
+        self.pool_size = pool_size
+        self.host_pool_sizes = dict(host_pool_sizes or {})
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = limiter
+        self.retry = retry
+        self.base_urls = dict(base_urls or {})
+        self.loads = get_decoder(decoder)
+        self.instruments = instruments or Instruments()
+        self.coalesce = coalesce
+        self.flights = SingleFlight()
+        self.identities = IdentityMap()
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter(pool_size))
+        self.session.mount("http://", self._adapter(pool_size))
+        for host in set(HOSTS) | set(self.host_pool_sizes):
+            self.session.mount(
+                "https://{0}/".format(host),
+                self._adapter(self.host_pool_sizes.get(host, pool_size))
+            )
+
+    def __repr__(self):
+        """Represent the transport."""
+        return "<Transport pool_size={0}>".format(self.pool_size)
+
+    __str__ = __repr__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _adapter(size):
+        """Make an adapter keeping up to size connections alive."""
+        return HTTPAdapter(pool_connections=1, pool_maxsize=size)
+
+    def get(self, url, stream=False, endpoint=None, **kwargs):
+        """GET an URL through the pooled session (and the cache, if any).
+        endpoint is the path template of url, like "projects/{0}", for
+        the hooks of instruments.
+        """
+        if self.base_urls:
+            url = rewrite_url(url, self.base_urls)
+        kwargs.setdefault("timeout", self.timeout)
+        cached = (self.cache is not None and not stream
+                  and "headers" not in kwargs)
+        if self.instruments.active:
+            return self._instrumented(url, endpoint, cached, stream, kwargs)
+        if cached:
+            return self.cache.get(
+                url, lambda headers: self._send(url, headers=headers, **kwargs)
+            )
+        return self._send(url, stream=stream, **kwargs)
+
+    def get_json(self, url, endpoint=None):
+        """GET an URL and return the response and its parsed JSON (None
+        for 5xx and 429 responses, which are not JSON). Concurrent calls
+        for the same URL share one request and its parsed JSON.
+        """
+        if not self.coalesce:
+            return self._get_json(url, endpoint)
+        return self.flights.do(url, lambda: self._get_json(url, endpoint))
+
+    def _get_json(self, url, endpoint):
+        resp = self.get(url, endpoint=endpoint)
+        if resp.status_code >= 500 or resp.status_code == 429:
+            return resp, None
+        return resp, self.loads(resp.content)
+
+    def _instrumented(self, url, endpoint, cached, stream, kwargs):
+        """get(), calling the hooks of instruments around it."""
+        event = RequestEvent(endpoint=endpoint or url, url=url,
+                             cache_hit=cached)
+        for hook in self.instruments.before:
+            hook(event)
+        def send(headers):
+            event.cache_hit = False
+            return self._send(url, event=event, headers=headers, **kwargs)
+        start = time.perf_counter()
+        try:
+            if cached:
+                resp = self.cache.get(url, send)
+            else:
+                resp = self._send(url, event=event, stream=stream, **kwargs)
+        except Exception as exc:
+            event.error = exc
+            raise
+        else:
+            event.status = resp.status_code
+            if "Content-Length" in resp.headers:
+                event.bytes = int(resp.headers["Content-Length"])
+            elif not stream:
+                event.bytes = len(resp.content)
+        finally:
+            event.latency = time.perf_counter() - start
+            for hook in self.instruments.after:
+                hook(event)
+        return resp
+
+    def _send(self, url, event=None, **kwargs):
+        """GET an URL, waiting for the limiter and retrying as the retry
+        policy says. After the last retry, the response is returned (or
+        the error raised) as it is. The retries are counted in event.
+        """
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire(url)
+            try:
+                resp = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if self.retry is None or not self.retry.should_retry(attempt):
+                    raise
+                status, retry_after = None, None
+            else:
+                if (self.retry is None or not self.retry.should_retry(
+                        attempt, resp.status_code)):
+                    return resp
+                status = resp.status_code
+                retry_after = resp.headers.get("Retry-After")
+                resp.close()
+            self._back_off(url, attempt, status, retry_after)
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+
+    def _back_off(self, url, attempt, status, retry_after):
+        """Wait before a retry. On 429, every thread talking to the host
+        waits (through the limiter), not just this one.
+        """
+        wait = self.retry.delay(attempt, retry_after)
+        if self.limiter is not None and status == 429:
+            self.limiter.pause(url, wait)
+        elif wait:
+            time.sleep(wait)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+    def install(self):
+        """Make this transport the one used by every API call."""
+        with Transport._default_lock:
+            Transport._default = self
+        return self
+
+    @classmethod
+    def default(cls):
+        """Return the shared transport, creating it if needed."""
+        if Transport._default is None:
+            with Transport._default_lock:
+                if Transport._default is None:
+                    Transport._default = cls()
+        return Transport._default
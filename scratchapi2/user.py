@@ -1,393 +1,754 @@
-"""
-Scratch API User
-
-Anything returned from API does not contain any attributes.
-Use info() to set/get it.
-
-Contains classes:
-* Project
-* User
-* Classroom
-* Comment
-"""
-
-import warnings
-import requests
-from .excs import ScratchAPIError
-
-#pylint: disable=too-many-instance-attributes,too-many-function-args
-
-def _request(path, *opts, api_url="https://api.scratch.mit.edu/"):
-    result = requests.get(api_url + path.format(*opts)).json()
-    if 'code' in result:
-        raise ScratchAPIError(result['code'] + ': ' + result['message'])
-    return result
-
-def _streaming_request(fileobj, path, *opts,
-                       api_url="https://projects.scratch.mit.edu/"):
-    """Make a large request (usually a project's JSON). This must provide
-    a file object ``fileobj`` to copy the request into.
-    """
-    req = requests.get(api_url + path.format(*opts), stream=True)
-    for block in req.iter_content(1024):
-        fileobj.write(block)
-
-class Project(object):
-    """Represents a Scratch Project."""
-
-    projectid = None
-
-    def __init__(self, projectid, getinfo=True):
-        """Initialize a Project."""
-        self.projectid = int(projectid)
-        if getinfo:
-            self.info()
-
-    def __repr__(self):
-        """Represent a Project."""
-        return "<Project {0}>".format(self.projectid)
-
-    __str__ = __repr__
-
-    def __eq__(self, other):
-        """If the project IDs are equal, the projects are considered equal."""
-        return self.projectid == other.projectid
-
-    def info(self):
-        """Get information about a project. It sets its dict and returns it."""
-        req = _request('projects/{0}', self.projectid)
-        self.title = req["title"]
-        self.description = req["description"]
-        self.instructions = req["instructions"]
-        self.visibility = req["visibility"]
-        self.public = req["public"]
-        self.comment_open = req["comments_allowed"]
-        self.author = User(req["author"]["username"], getinfo=True)
-        self.image = req["image"]
-        self.created = req["history"]["created"]
-        self.modified = req["history"]["modified"]
-        self.shared = req["history"]["shared"]
-        self.views = req["stats"]["views"]
-        self.loves = req["stats"]["loves"]
-        self.favorites = req["stats"]["favorites"]
-        self.comment_counts = req["stats"]["comments"]
-        #renamed to avoid conflict with "remix" method
-        self.remix_count = req["stats"]["remixes"]
-        self.parent = (
-            Project(req["remix"]["parent"], getinfo=True)
-            if req['remix']['parent']
-            else None
-        )
-        self.root = (
-            Project(req["remix"]["root"], getinfo=False)
-            if req['remix']['root']
-            else None
-        )
-
-        # Just for convenience
-        self.notes = self.description
-        self.credits = self.description
-        # links
-        self.url = "https://scratch.mit.edu/projects/{}".format(
-            self.projectid
-        )
-        self.remixes_url = self.url + "/remixes"
-        self.studios_url = self.url + "/studios"
-        self.see_inside_url = self.url + "/editor"
-        self.fullscreen_url = self.url + "/fullscreen"
-        self.embed_url = "https://scratch.mit.edu/projects/{}/embed/".format(
-            self.projectid
-        )
-        self.embed_html = """<iframe
-    allowtransparency="true"
-    width="485"
-    height="402"
-    src="{0}?autostart=false"
-    frameborder="0"
-    allowfullscreen
-></iframe>""".format(self.embed_url)
-        return self.__dict__.copy()
-
-    def remixes(self, limit=3, offset=0):
-        """Yield all remixes of this Project."""
-        req = _request("projects/{0}/remixes?limit={1}&offset={2}",
-                       self.projectid, limit, offset)
-        for remix in req:
-            yield Project(remix['id'], getinfo=False)
-
-    def studios(self, limit=3, offset=0):
-        """Yield all studios this Project belongs to."""
-        req = _request('projects/{0}/studios?limit={1}&offset={2}',
-                       self.projectid, limit, offset)
-        for studio in req:
-            yield Studio(studio["id"], getinfo=False)
-
-    def save_json(self, filename_or_obj):
-        """Save a project's JSON to a file."""
-        if isinstance(filename_or_obj, str):
-            filename_or_obj = open(filename_or_obj, 'wb')
-        with filename_or_obj:
-            _streaming_request(filename_or_obj,
-                               '{}',
-                               self.projectid)
-
-    def comments(self, limit=10, offset=0):
-        """ Get comments. Note that replies are not included here. """
-        req = _request('projects/{0}/comments?limit={1}&offset={2}',
-                       self.projectid, limit, offset)
-        for comment in req:
-            yield Comment(
-                comment_id=comment["id"],
-                sender=comment["author"]["username"],
-                path="projects/{0}/comments/".format(self.projectid),
-                content=comment["content"],
-                parent=None,
-                created=comment["datetime_created"],
-                last_modified=comment["datetime_modified"],
-                visibility=comment["visibility"],
-                reply_count=comment["reply_count"]
-            )
-
-    def comment(self, comment_id):
-        """ Get a specific comment of a project, by using ID.
-        limit and offset are not available - because it always returns one. """
-        comment = _request('projects/{0}/comments/{1}'.format(self.projectid, comment_id))[0]
-        return Comment(
-            comment_id=comment_id,
-            sender=comment["author"]["username"],
-            path="projects/{0}/comments/".format(self.projectid),
-            content=comment["content"],
-            parent=self.comment(comment["parent_id"]) if comment["parent_id"] else None,
-            created=comment["datetime_created"],
-            last_modified=comment["datetime_modified"],
-            visibility=comment["visibility"],
-            reply_count=comment["reply_count"]
-        )
-
-class User(object):
-    """Represents a Scratch user."""
-
-    username = None
-
-    def __init__(self, username, getinfo=True):
-        """Initialize a User."""
-        self.username = username
-        if getinfo:
-            self.info()
-
-    def __str__(self):
-        """Represent a User."""
-        return "<User {0}>".format(self.username)
-
-    __repr__ = __str__
-
-    def __eq__(self, other):
-        """If the usernames are equal, the Users are considered equal.
-        (Equality is case-insensitive)
-        """
-        return self.username.lower() == other.username.lower()
-
-    def info(self):
-        """Get information about an user. It sets its dict and returns it."""
-        req = _request('users/{0}', self.username)
-        self.userid = req["id"]
-        self.joined = req["history"]["joined"]
-        self.images = req["profile"]["images"]
-        self.status = req["profile"]["status"]
-        self.bio = req["profile"]["bio"]
-        self.country = req["profile"]["country"]
-        self.scratchteam = req["scratchteam"]
-
-        # Just for convenience
-        self.joined_at = self.joined
-        self.about_me = self.status
-        self.what_im_working_on = self.bio
-        self.what_working_on = self.bio
-        return self.__dict__.copy()
-
-    def following(self, limit=100, offset=0):
-        """Yield other Users this User follows."""
-        req = _request("users/{0}/following?limit={1}&offset={2}",
-                       self.username, limit, offset)
-        for user in req:
-            yield User(user["username"], getinfo=False)
-
-    def followers(self, limit=100, offset=0):
-        """Yield other Users that follow this User."""
-        req = requests.get("users/{0}/followers?limit={1}&offset={2}",
-                           self.username, limit, offset)
-        for user in req:
-            yield User(user["username"], getinfo=False)
-
-    def unread_messages(self):
-        """Return the number of messages this User has not read."""
-        req = _request("users/{0}/messages/count",
-                       self.username)
-        return req["count"]
-
-    def projects(self, limit=10, offset=0):
-        """Yield the user's Projects."""
-        req = _request("users/{0}/projects?limit={1}&offset={2}",
-                       self.username, limit, offset)
-        for project in req:
-            yield Project(project["id"], getinfo=False)
-
-    def favorites(self, limit=10, offset=0):
-        """Yield the user's favorite Projects."""
-        req = _request("users/{0}/favorites?limit={1}&offset={2}",
-                       self.username, limit, offset)
-        for project in req:
-            yield Project(project["id"], getinfo=False)
-
-    def curating(self, limit=10, offset=0):
-        """ Yield what studios the user is curating. """
-        req = _request("users/{0}/studios/curate?limit={1}&offset={2}",
-                       self.username, limit, offset)
-        for studio in req:
-            yield Studio(studio["id"], getinfo=False)
-
-class Classroom(object):
-    """Represents a Scratch Classroom."""
-
-    classid = None
-
-    def __init__(self, classid, getinfo=True):
-        """Initialize a Classroom."""
-        self.classid = int(classid)
-        if getinfo:
-            self.info()
-
-    def __str__(self):
-        """Represent a Classroom."""
-        return "<Class {0}>".format(self.classid)
-
-    __repr__ = __str__
-
-    def __eq__(self, other):
-        """If the class IDs are equal, the Classroooms are considered equal."""
-        return self.classid == other.classid
-
-    def info(self):
-        """Get an information about a classroom. It sets its dict
-        and returns it.
-        """
-        req = _request("https://api.scratch.mit.edu/classrooms/{0}",
-                       self.classid)
-        self.title = req["title"]
-        self.start = req["date_start"]
-        self.end = req["date_end"]
-        self.images = req["images"]
-        self.status = req["status"]
-        self.description = req["description"]
-        self.educator = User(req["educator"]["username"], getinfo=True)
-
-        # Just for convenience
-        self.about_class = self.status
-        self.bio = self.description
-        self.what_were_working_on = self.description
-        self.what_working_on = self.description
-        self.teacher = self.educator
-        return self.__dict__.copy()
-
-class Comment(object):
-    """ A comment. """
-    def __init__(self, comment_id, sender, path=None, content=None, parent=None,
-                 created=None, last_modified=None, reply_count=0, visibility="visible"):
-        """ Initialize a comment. """
-        self.comment_id = comment_id
-        self.sender = User(sender, getinfo=True)
-        self.author = self.sender
-        self._path = path
-        self.content = content
-        self.parent = parent
-        self.reply_count = reply_count
-        self.created = created
-        self.last_modified = last_modified
-        self.visibility = visibility
-
-    def __str__(self):
-        """ Represent a comment """
-        return "<Comment {0}>".format(self.comment_id)
-
-    __repr__ = __str__
-
-    @property
-    def is_modified(self):
-        """ Check if a comment has been modified. """
-        return self.created != self.last_modified
-
-    @property
-    def has_reply(self):
-        """ Check if a comment has replies. """
-        return self.reply_count > 0
-
-    def replies(self, limit=3, offset=0): # pylint: disable=inconsistent-return-statements
-        """ Get replies. """
-        if not self.has_reply:
-            return []
-        replies = _request("{0}{1}/replies?limit={2}&offset={3}",
-                           self._path,
-                           self.comment_id,
-                           limit,
-                           offset)
-        for reply in replies:
-            yield Comment(
-                comment_id=reply["id"],
-                sender=reply["author"]["username"],
-                path=self._path,
-                content=reply["content"],
-                parent=self,
-                created=reply["datetime_created"],
-                last_modified=reply["datetime_modified"],
-                reply_count=0,
-                visibility=reply["visibility"]
-            )
-
-class Studio(object):
-    """Represents a studio. """
-    studioid = None
-    def __init__(self, studioid, getinfo=True):
-        """Initialize studio class."""
-        self.studioid = int(studioid)
-        if getinfo:
-            self.info()
-
-    def __str__(self):
-        """Represent a studio."""
-        return "<Studio {0}>".format(self.studioid)
-
-    __repr__ = __str__
-
-    def info(self):
-        """Get an information about a studio. It sets its dict
-        and returns it.
-        """
-        req = _request("https://api.scratch.mit.edu/studios/{0}",
-                       self.studioid)
-        self.title = req["title"]
-        self.image = req["image"]
-        self.description = req["description"]
-        self.owner_id = req["owner"]
-        self.visibility = req["visibility"]
-        self.created = req["history"]["created"]
-        self.modified = req["history"]["modified"]
-        self.followers = req["stats"]["followers"]
-        # Just for convenience
-        self.author_id = self.owner_id
-        return self.__dict__.copy()
-
-    @property
-    def owner(self):
-        """Warns the user that this returns User ID."""
-        warnings.warn("Warning: this property returns the owner's ID due "
-                      "to a bug with API. Don't pass this value to User(), "
-                      "because it cannot handle IDs-to-usernames. To dismiss "
-                      "this warning, use Studio.owner_id.", UserWarning)
-        return self.owner_id
-
-    def projects(self, limit=5, offset=0):
-        """Gets list of projects in a studio."""
-        req = _request("https://api.scratch.mit.edu/studios/{0}/projects?limit={1}&offset={2}",
-                       self.studioid, limit, offset)
-        for project in req:
-            yield Project(project["id"], getinfo=False)
+"""
+Scratch API User
+
+Nothing is requested when an object is made. The first time an
+attribute that is not set yet is read, info() is called to load it.
+Objects yielded by listings already have the attributes the listing
+itself returned, so reading those costs nothing. Models keep their
+fields in __slots__; aliases (like Project.notes) and links (like
+Project.embed_url) are properties computed when they are read.
+
+There is only one object per project, user, studio or classroom (see
+IdentityMap): User("griffpatch") is the same object every time, keeping
+whatever was already loaded, and models can be put in sets and dicts.
+Copying or unpickling one gives the live object too, if there is one.
+
+Contains classes:
+* Project
+* User
+* Classroom
+* Comment
+"""
+
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .excs import ScratchAPIError, FetchError, Maintenance, RateLimited
+from .transport import Transport
+from .download import CHUNK_SIZE, download, stream
+
+#pylint: disable=too-many-instance-attributes,too-many-function-args,attribute-defined-outside-init
+
+def _request(path, *opts, api_url="https://api.scratch.mit.edu/"):
+    req, result = Transport.default().get_json(api_url + path.format(*opts),
+                                               endpoint=path.split("?", 1)[0])
+    if req.status_code >= 500:
+        raise Maintenance
+    if req.status_code == 429:
+        raise RateLimited(req.url)
+    if 'code' in result:
+        raise ScratchAPIError(result['code'] + ': ' + result['message'])
+    return result
+
+def _assign(obj, data, fields):
+    """Set obj's attributes from a payload. fields is a tuple of
+    (attribute, keys) pairs; fields missing in data are left unset.
+    """
+    for attr, keys in fields:
+        value = data
+        try:
+            for key in keys:
+                value = value[key]
+        except (KeyError, TypeError):
+            continue
+        setattr(obj, attr, value)
+
+class _LazyModel(object):
+    """Base class for models loading themselves with info() the first
+    time one of the attributes in _lazy is read.
+    """
+
+    __slots__ = ("_loaded", "__weakref__")
+
+    _lazy = frozenset()
+    _aliases = ()
+    _autoload = True
+
+    def __new__(cls, key, *args, **kwargs): # pylint: disable=unused-argument
+        """Return the live object for key, if there is one."""
+        return cls._identities().get(cls, cls._key(key))
+
+    @staticmethod
+    def _identities():
+        """Return the IdentityMap objects are kept in."""
+        return Transport.default().identities
+
+    @staticmethod
+    def _key(key):
+        """Return the identity of key (an ID, by default)."""
+        return int(key)
+
+    def __getattr__(self, name):
+        """Load the object if name is one of its fields."""
+        if name in self._lazy and not getattr(self, "_loaded", False):
+            if not self._autoload:
+                raise AttributeError(
+                    "{0} is not loaded yet, get it with info()".format(name)
+                )
+            self.info()
+            return getattr(self, name)
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(
+            type(self).__name__, name
+        ))
+
+    def __getstate__(self):
+        """Return the slots that are set, for pickle and copy, without
+        loading what is not.
+        """
+        state = {}
+        for klass in type(self).__mro__:
+            for name in getattr(klass, "__slots__", ()):
+                if name == "__weakref__":
+                    continue
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        return None, state
+
+    def _as_dict(self):
+        """Return the fields that are set, then the aliases, as a dict."""
+        result = {}
+        for klass in reversed(type(self).__mro__):
+            for name in getattr(klass, "__slots__", ()):
+                if not name.startswith("_") and hasattr(self, name):
+                    result[name] = getattr(self, name)
+        for name in self._aliases:
+            try:
+                result[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return result
+
+    @classmethod
+    def fetch_many(cls, keys, workers=8):
+        """Load an object for every key (ID or username) in keys, running
+        up to workers info() requests at once. Yields them in the order
+        of keys. If one fails, a FetchError is yielded in its place and
+        the rest are still loaded.
+        """
+        return _fetch_many(cls, keys, workers)
+
+def _fetch_many(cls, keys, workers):
+    """Make a cls for every key and call info() on it, in a pool of
+    workers threads, yielding them (or a FetchError) in order. At most
+    2 * workers are held at once.
+    """
+    def load(key):
+        obj = key
+        try:
+            obj = cls(key)
+            obj.info()
+        except Exception as exc: # pylint: disable=broad-except
+            return FetchError(obj, exc)
+        return obj
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for key in keys:
+            pending.append(pool.submit(load, key))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _streaming_request(fileobj, path, *opts,
+                       api_url="https://projects.scratch.mit.edu/",
+                       chunk_size=CHUNK_SIZE):
+    """Make a large request (usually a project's JSON). This must provide
+    a file object ``fileobj`` to copy the request into.
+    """
+    stream(api_url + path.format(*opts), fileobj, chunk_size, endpoint=path)
+
+class Project(_LazyModel):
+    """Represents a Scratch Project."""
+
+    def __init__(self, projectid, getinfo=False):
+        """Initialize a Project. If getinfo is true, it is loaded now
+        instead of when an attribute is first read.
+        """
+        self.projectid = int(projectid)
+        if getinfo:
+            self.info()
+
+    def __repr__(self):
+        """Represent a Project."""
+        return "<Project {0}>".format(self.projectid)
+
+    __str__ = __repr__
+
+    def __eq__(self, other):
+        """If the project IDs are equal, the projects are considered equal."""
+        if not isinstance(other, Project):
+            return NotImplemented
+        return self.projectid == other.projectid
+
+    def __hash__(self):
+        return hash(self.projectid)
+
+    def __getnewargs__(self):
+        """Return the arguments of Project() for pickle and copy, which
+        give the live object for the project, if there is one.
+        """
+        return (self.projectid,)
+
+    _fields = (
+        ("title", ("title",)),
+        ("description", ("description",)),
+        ("instructions", ("instructions",)),
+        ("visibility", ("visibility",)),
+        ("public", ("public",)),
+        ("comment_open", ("comments_allowed",)),
+        ("image", ("image",)),
+        ("created", ("history", "created")),
+        ("modified", ("history", "modified")),
+        ("shared", ("history", "shared")),
+        ("views", ("stats", "views")),
+        ("loves", ("stats", "loves")),
+        ("favorites", ("stats", "favorites")),
+        ("comment_counts", ("stats", "comments")),
+        #renamed to avoid conflict with "remix" method
+        ("remix_count", ("stats", "remixes")),
+    )
+    __slots__ = ("projectid", "author", "parent", "root") + tuple(
+        field for field, _ in _fields
+    )
+    _lazy = frozenset(field for field, _ in _fields) | {
+        "author", "parent", "root"
+    }
+    _aliases = ("notes", "credits", "url", "remixes_url", "studios_url",
+                "see_inside_url", "fullscreen_url", "embed_url", "embed_html")
+
+    @classmethod
+    def from_json(cls, project):
+        """Make a Project from a project payload, like the ones listings
+        return, without requesting anything.
+        """
+        obj = cls(project["id"])
+        obj._load(project)
+        return obj
+
+    def info(self):
+        """Get information about a project. It sets its fields and returns them."""
+        self._load(_request('projects/{0}', self.projectid))
+        self._loaded = True
+        return self._as_dict()
+
+    def _load(self, req):
+        """Set attributes from a project payload. The author and parent
+        are not requested until their attributes are read.
+        """
+        _assign(self, req, self._fields)
+        if "author" in req:
+            self.author = self._user_class.from_json(req["author"])
+        if "remix" in req:
+            self.parent = (
+                self._project_class(req["remix"]["parent"])
+                if req['remix']['parent']
+                else None
+            )
+            self.root = (
+                self._project_class(req["remix"]["root"])
+                if req['remix']['root']
+                else None
+            )
+
+    # Just for convenience
+    @property
+    def notes(self):
+        """The description (Notes and Credits)."""
+        return self.description
+
+    credits = notes
+
+    # links
+    @property
+    def url(self):
+        """The URL of the project page."""
+        return "https://scratch.mit.edu/projects/{}".format(self.projectid)
+
+    @property
+    def remixes_url(self):
+        """The URL of the remixes page."""
+        return self.url + "/remixes"
+
+    @property
+    def studios_url(self):
+        """The URL of the studios page."""
+        return self.url + "/studios"
+
+    @property
+    def see_inside_url(self):
+        """The URL of the project in the editor."""
+        return self.url + "/editor"
+
+    @property
+    def fullscreen_url(self):
+        """The URL of the project in full screen."""
+        return self.url + "/fullscreen"
+
+    @property
+    def embed_url(self):
+        """The URL to embed the project with."""
+        return "https://scratch.mit.edu/projects/{}/embed/".format(
+            self.projectid
+        )
+
+    @property
+    def embed_html(self):
+        """The HTML to embed the project with."""
+        return """<iframe
+    allowtransparency="true"
+    width="485"
+    height="402"
+    src="{0}?autostart=false"
+    frameborder="0"
+    allowfullscreen
+></iframe>""".format(self.embed_url)
+
+    def remixes(self, limit=3, offset=0):
+        """Yield all remixes of this Project."""
+        req = _request("projects/{0}/remixes?limit={1}&offset={2}",
+                       self.projectid, limit, offset)
+        for remix in req:
+            yield self._project_class.from_json(remix)
+
+    def ancestors(self):
+        """Yield the parent of this Project, then its parent, and so on
+        up to the project everything was remixed from. Each one is
+        loaded (one request) to find the next.
+        """
+        project = self.parent
+        while project is not None:
+            yield project
+            project = project.parent
+
+    def studios(self, limit=3, offset=0):
+        """Yield all studios this Project belongs to."""
+        req = _request('projects/{0}/studios?limit={1}&offset={2}',
+                       self.projectid, limit, offset)
+        for studio in req:
+            yield self._studio_class.from_json(studio)
+
+    def save_json(self, filename_or_obj, chunk_size=CHUNK_SIZE, resume=True):
+        """Save a project's JSON to a file, chunk_size bytes at a time.
+        If a filename is given and an earlier download of it was cut,
+        only the rest is downloaded (unless resume is false). Read it
+        with scratchapi2.download.scan_project().
+        """
+        url = "https://projects.scratch.mit.edu/{}".format(self.projectid)
+        if isinstance(filename_or_obj, str):
+            download(url, filename_or_obj, chunk_size, resume, endpoint="{0}")
+            return
+        with filename_or_obj:
+            stream(url, filename_or_obj, chunk_size, endpoint="{0}")
+
+    def comments(self, limit=10, offset=0):
+        """ Get comments. Note that replies are not included here. """
+        req = _request('projects/{0}/comments?limit={1}&offset={2}',
+                       self.projectid, limit, offset)
+        for comment in req:
+            yield self._comment_class.from_json(
+                comment,
+                path="projects/{0}/comments/".format(self.projectid)
+            )
+
+    def comment(self, comment_id):
+        """ Get a specific comment of a project, by using ID.
+        limit and offset are not available - because it always returns one. """
+        chain = []
+        while comment_id:
+            chain.append(_request('projects/{0}/comments/{1}',
+                                  self.projectid, comment_id))
+            comment_id = chain[-1]["parent_id"]
+        comment = None
+        for item in reversed(chain):
+            comment = self._comment_class.from_json(
+                item,
+                path="projects/{0}/comments/".format(self.projectid),
+                parent=comment
+            )
+        return comment
+
+class User(_LazyModel):
+    """Represents a Scratch user."""
+
+    def __init__(self, username, getinfo=False):
+        """Initialize a User. If getinfo is true, it is loaded now
+        instead of when an attribute is first read.
+        """
+        if getattr(self, "username", None) is None:
+            self.username = username
+        if getinfo:
+            self.info()
+
+    def __str__(self):
+        """Represent a User."""
+        return "<User {0}>".format(self.username)
+
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        """If the usernames are equal, the Users are considered equal.
+        (Equality is case-insensitive)
+        """
+        if not isinstance(other, User):
+            return NotImplemented
+        return self.username.lower() == other.username.lower()
+
+    def __hash__(self):
+        return hash(self.username.lower())
+
+    def __getnewargs__(self):
+        """Return the arguments of User(), for pickle and copy."""
+        return (self.username,)
+
+    @staticmethod
+    def _key(key):
+        return key.lower()
+
+    _fields = (
+        ("userid", ("id",)),
+        ("joined", ("history", "joined")),
+        ("images", ("profile", "images")),
+        ("status", ("profile", "status")),
+        ("bio", ("profile", "bio")),
+        ("country", ("profile", "country")),
+        ("scratchteam", ("scratchteam",)),
+    )
+    __slots__ = ("username",) + tuple(field for field, _ in _fields)
+    _lazy = frozenset(field for field, _ in _fields)
+    _aliases = ("joined_at", "about_me", "what_im_working_on",
+                "what_working_on")
+
+    @classmethod
+    def from_json(cls, user):
+        """Make a User from a user payload, like the ones listings
+        return, without requesting anything.
+        """
+        obj = cls(user["username"])
+        obj._load(user)
+        return obj
+
+    def info(self):
+        """Get information about an user. It sets its fields and returns them."""
+        self._load(_request('users/{0}', self.username))
+        self._loaded = True
+        return self._as_dict()
+
+    def _load(self, req):
+        """Set attributes from a user payload."""
+        _assign(self, req, self._fields)
+
+    # Just for convenience
+    @property
+    def joined_at(self):
+        """When the user joined."""
+        return self.joined
+
+    @property
+    def about_me(self):
+        """The "About me" of the profile."""
+        return self.status
+
+    @property
+    def what_im_working_on(self):
+        """The "What I'm working on" of the profile."""
+        return self.bio
+
+    what_working_on = what_im_working_on
+
+    def following(self, limit=100, offset=0):
+        """Yield other Users this User follows (one page; Paginator walks
+        them all, and FollowGraph the users they follow, and so on).
+        """
+        req = _request("users/{0}/following?limit={1}&offset={2}",
+                       self.username, limit, offset)
+        for user in req:
+            yield User.from_json(user)
+
+    def followers(self, limit=100, offset=0):
+        """Yield other Users that follow this User (one page)."""
+        req = _request("users/{0}/followers?limit={1}&offset={2}",
+                       self.username, limit, offset)
+        for user in req:
+            yield User.from_json(user)
+
+    def unread_messages(self):
+        """Return the number of messages this User has not read."""
+        req = _request("users/{0}/messages/count",
+                       self.username)
+        return req["count"]
+
+    def projects(self, limit=10, offset=0):
+        """Yield the user's Projects."""
+        req = _request("users/{0}/projects?limit={1}&offset={2}",
+                       self.username, limit, offset)
+        for project in req:
+            yield Project.from_json(project)
+
+    def favorites(self, limit=10, offset=0):
+        """Yield the user's favorite Projects."""
+        req = _request("users/{0}/favorites?limit={1}&offset={2}",
+                       self.username, limit, offset)
+        for project in req:
+            yield Project.from_json(project)
+
+    def curating(self, limit=10, offset=0):
+        """ Yield what studios the user is curating. """
+        req = _request("users/{0}/studios/curate?limit={1}&offset={2}",
+                       self.username, limit, offset)
+        for studio in req:
+            yield Studio.from_json(studio)
+
+class Classroom(_LazyModel):
+    """Represents a Scratch Classroom."""
+
+    def __init__(self, classid, getinfo=False):
+        """Initialize a Classroom. If getinfo is true, it is loaded now
+        instead of when an attribute is first read.
+        """
+        self.classid = int(classid)
+        if getinfo:
+            self.info()
+
+    def __str__(self):
+        """Represent a Classroom."""
+        return "<Class {0}>".format(self.classid)
+
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        """If the class IDs are equal, the Classroooms are considered equal."""
+        if not isinstance(other, Classroom):
+            return NotImplemented
+        return self.classid == other.classid
+
+    def __hash__(self):
+        return hash(self.classid)
+
+    def __getnewargs__(self):
+        """Return the arguments of Classroom(), for pickle and copy."""
+        return (self.classid,)
+
+    _fields = (
+        ("title", ("title",)),
+        ("start", ("date_start",)),
+        ("end", ("date_end",)),
+        ("images", ("images",)),
+        ("status", ("status",)),
+        ("description", ("description",)),
+    )
+    __slots__ = ("classid", "educator") + tuple(field for field, _ in _fields)
+    _lazy = frozenset(field for field, _ in _fields) | {"educator"}
+    _aliases = ("teacher", "about_class", "bio", "what_were_working_on",
+                "what_working_on")
+
+    def info(self):
+        """Get an information about a classroom. It sets its fields
+        and returns them.
+        """
+        self._load(_request("classrooms/{0}", self.classid))
+        self._loaded = True
+        return self._as_dict()
+
+    def _load(self, req):
+        """Set attributes from a classroom payload. The educator is not
+        requested until their attributes are read.
+        """
+        _assign(self, req, self._fields)
+        if "educator" in req:
+            self.educator = self._user_class.from_json(req["educator"])
+
+    # Just for convenience
+    @property
+    def teacher(self):
+        """The educator."""
+        return self.educator
+
+    @property
+    def about_class(self):
+        """The "About this class" of the classroom."""
+        return self.status
+
+    @property
+    def bio(self):
+        """The "What we're working on" of the classroom."""
+        return self.description
+
+    what_were_working_on = what_working_on = bio
+
+class Comment(object):
+    """ A comment. """
+
+    __slots__ = ("comment_id", "sender", "_path", "content", "parent",
+                 "reply_count", "created", "last_modified", "visibility")
+
+    def __init__(self, comment_id, sender, path=None, content=None, parent=None,
+                 created=None, last_modified=None, reply_count=0, visibility="visible"):
+        """ Initialize a comment. """
+        self.comment_id = comment_id
+        self.sender = self._user_class(sender)
+        self._path = path
+        self.content = content
+        self.parent = parent
+        self.reply_count = reply_count
+        self.created = created
+        self.last_modified = last_modified
+        self.visibility = visibility
+
+    @classmethod
+    def from_json(cls, comment, path=None, parent=None):
+        """ Make a comment from a comment payload. """
+        return cls(
+            comment_id=comment["id"],
+            sender=comment["author"]["username"],
+            path=path,
+            content=comment["content"],
+            parent=parent,
+            created=comment["datetime_created"],
+            last_modified=comment["datetime_modified"],
+            reply_count=comment["reply_count"],
+            visibility=comment["visibility"]
+        )
+
+    def __str__(self):
+        """ Represent a comment """
+        return "<Comment {0}>".format(self.comment_id)
+
+    __repr__ = __str__
+
+    @property
+    def author(self):
+        """ The sender. """
+        return self.sender
+
+    @property
+    def is_modified(self):
+        """ Check if a comment has been modified. """
+        return self.created != self.last_modified
+
+    @property
+    def has_reply(self):
+        """ Check if a comment has replies. """
+        return self.reply_count > 0
+
+    def replies(self, limit=3, offset=0): # pylint: disable=inconsistent-return-statements
+        """ Get replies. """
+        if not self.has_reply:
+            return []
+        replies = _request("{0}{1}/replies?limit={2}&offset={3}",
+                           self._path,
+                           self.comment_id,
+                           limit,
+                           offset)
+        for reply in replies:
+            yield self.from_json(reply, path=self._path, parent=self)
+
+class Studio(_LazyModel):
+    """Represents a studio. """
+    def __init__(self, studioid, getinfo=False):
+        """Initialize studio class. If getinfo is true, it is loaded now
+        instead of when an attribute is first read.
+        """
+        self.studioid = int(studioid)
+        if getinfo:
+            self.info()
+
+    def __str__(self):
+        """Represent a studio."""
+        return "<Studio {0}>".format(self.studioid)
+
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        """If the studio IDs are equal, the studios are considered equal."""
+        if not isinstance(other, Studio):
+            return NotImplemented
+        return self.studioid == other.studioid
+
+    def __hash__(self):
+        return hash(self.studioid)
+
+    def __getnewargs__(self):
+        """Return the arguments of Studio(), for pickle and copy."""
+        return (self.studioid,)
+
+    _fields = (
+        ("title", ("title",)),
+        ("image", ("image",)),
+        ("description", ("description",)),
+        ("visibility", ("visibility",)),
+        ("created", ("history", "created")),
+        ("modified", ("history", "modified")),
+        ("followers", ("stats", "followers")),
+    )
+    __slots__ = ("studioid", "owner_id") + tuple(field for field, _ in _fields)
+    _lazy = frozenset(field for field, _ in _fields) | {"owner_id"}
+    _aliases = ("author_id",)
+
+    @classmethod
+    def from_json(cls, studio):
+        """Make a Studio from a studio payload, like the ones listings
+        return, without requesting anything.
+        """
+        obj = cls(studio["id"])
+        obj._load(studio)
+        return obj
+
+    def info(self):
+        """Get an information about a studio. It sets its fields
+        and returns them.
+        """
+        self._load(_request("studios/{0}", self.studioid))
+        self._loaded = True
+        return self._as_dict()
+
+    def _load(self, req):
+        """Set attributes from a studio payload."""
+        _assign(self, req, self._fields)
+        if "host" in req or "owner" in req:
+            self.owner_id = req.get("host", req.get("owner"))
+
+    # Just for convenience
+    @property
+    def author_id(self):
+        """The owner's user ID."""
+        return self.owner_id
+
+    @property
+    def owner(self):
+        """Warns the user that this returns User ID."""
+        warnings.warn("Warning: this property returns the owner's ID due "
+                      "to a bug with API. Don't pass this value to User(), "
+                      "because it cannot handle IDs-to-usernames. To dismiss "
+                      "this warning, use Studio.owner_id.", UserWarning)
+        return self.owner_id
+
+    def projects(self, limit=5, offset=0):
+        """Gets list of projects in a studio."""
+        req = _request("studios/{0}/projects?limit={1}&offset={2}",
+                       self.studioid, limit, offset)
+        for project in req:
+            yield Project.from_json(_studio_project(project))
+
+def _studio_project(project):
+    """Turn an item of a studio's project list into a project payload."""
+    return {
+        "id": project["id"],
+        "title": project["title"],
+        "image": project["image"],
+        "author": {
+            "id": project["creator_id"],
+            "username": project["username"]
+        }
+    }
+
+# The classes models make for related objects. scratchapi2.aio swaps them
+# for its own ones.
+# pylint: disable=protected-access
+Project._user_class = User
+Project._project_class = Project
+Project._comment_class = Comment
+Project._studio_class = Studio
+Classroom._user_class = User
+Comment._user_class = User
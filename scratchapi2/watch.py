@@ -0,0 +1,261 @@
+"""
+Watcher - polls many users, projects and studios for what is new.
+
+    watcher = Watcher()
+    watcher.watch(User("griffpatch"))       # new projects
+    watcher.watch(Project(104))             # new comments
+    watcher.watch(Studio(5))                # projects added to it
+    for change in watcher:                  # until watcher.stop()
+        print(change)       # <NewProject <Project 1234> of <User griffpatch>>
+
+Only a high-water mark is kept for each target: the IDs of the newest
+few items seen. A poll requests the listing, newest first (the way the
+API sends it), until it reaches one of them, so a quiet target costs
+one small request. The first poll of a target only sets its mark.
+
+Polls are spread out. Each target has an interval of its own, halved
+(down to min_interval) when a poll finds something and made half as
+long again (up to max_interval) when it does not, and the first polls
+are scattered over the first interval.
+
+watcher.checkpoint() is a plain dict, ready for json.dump(), and
+Watcher.from_checkpoint() goes on from it.
+
+class Watcher
+- watch() / unwatch()
+- poll()
+- changes() (iter(watcher))
+- stop()
+- checkpoint() / from_checkpoint()
+NewProject, NewComment, StudioAddition (the changes)
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from .excs import FetchError
+from .gclass import GenericData
+from .paginate import MAX_PAGE_SIZE
+from .user import User, Project, Studio
+
+#pylint: disable=too-many-instance-attributes
+
+class NewProject(GenericData):
+    """item, a Project, was shared by target, a User."""
+    _repr_str = "<NewProject {item} of {target}>"
+    target = None
+    item = None
+
+class NewComment(GenericData):
+    """item, a Comment, was posted on target, a Project."""
+    _repr_str = "<NewComment {item} on {target}>"
+    target = None
+    item = None
+
+class StudioAddition(GenericData):
+    """item, a Project, was added to target, a Studio."""
+    _repr_str = "<StudioAddition {item} to {target}>"
+    target = None
+    item = None
+
+# name: used in checkpoints; method: the listing of cls to poll;
+# item_id: the attribute telling its items apart; key: the one of cls.
+_Kind = namedtuple("_Kind", "name cls method change item_id key")
+
+_KINDS = (
+    _Kind("user", User, "projects", NewProject, "projectid", "username"),
+    _Kind("project", Project, "comments", NewComment, "comment_id",
+          "projectid"),
+    _Kind("studio", Studio, "projects", StudioAddition, "projectid",
+          "studioid"),
+)
+
+def _kind_of(target):
+    for kind in _KINDS:
+        if isinstance(target, kind.cls):
+            return kind
+    raise TypeError("Cannot watch {0!r}".format(target))
+
+class _Watch(object):
+    """A watched target: its mark and when to poll it next."""
+    __slots__ = ("target", "kind", "head", "interval", "due")
+
+    def __init__(self, target, kind, head, interval, due):
+        self.target = target
+        self.kind = kind
+        self.head = head
+        self.interval = interval
+        self.due = due
+
+class Watcher(object):
+    """Polls the watched targets, each every min_interval to
+    max_interval seconds. A poll requests up to max_pages pages of
+    page_size items; the newest head_size IDs are kept as the mark.
+    Up to workers targets are polled at once.
+    """
+
+    def __init__(self, min_interval=60, max_interval=3600,
+                 page_size=MAX_PAGE_SIZE, max_pages=10, head_size=5,
+                 workers=8):
+        """Initialize the watcher. Nothing is requested yet."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.head_size = head_size
+        self.workers = workers
+        self.polls = 0
+        self._watches = {}
+        # (due, seq, watch); a watch that is gone or was rescheduled
+        # leaves its entry behind, and it is skipped.
+        self._heap = []
+        self._seq = itertools.count()
+        # Guards _watches and _heap: targets can be watched and
+        # unwatched from other threads while changes() runs.
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def __repr__(self):
+        """Represent the watcher."""
+        return "<Watcher ({0} targets)>".format(len(self._watches))
+
+    __str__ = __repr__
+
+    def __len__(self):
+        return len(self._watches)
+
+    def __iter__(self):
+        return self.changes()
+
+    def _schedule(self, watch, due):
+        """Put watch in the heap, due then. Call with _lock held."""
+        watch.due = due
+        heapq.heappush(self._heap, (due, next(self._seq), watch))
+
+    def watch(self, target, head=None, interval=None):
+        """Watch target, a User, Project or Studio. head and interval
+        are the mark and interval to start with (as in checkpoints). If
+        target is watched already, its mark is kept unless head is given.
+        """
+        kind = _kind_of(target)
+        with self._lock:
+            old = self._watches.get(target)
+            if head is None and old is not None:
+                head = old.head
+            watch = _Watch(target, kind, head, interval or self.min_interval,
+                           None)
+            self._watches[target] = watch
+            self._schedule(watch, time.time()
+                           + random.uniform(0, watch.interval))
+
+    def unwatch(self, target):
+        """Stop watching target."""
+        with self._lock:
+            self._watches.pop(target, None)
+
+    def _poll(self, watch):
+        """Poll one target, returning its new items, newest first."""
+        method = getattr(watch.target, watch.kind.method)
+        new = []
+        reached = False
+        pages = self.max_pages if watch.head is not None else 1
+        for page in range(pages):
+            items = list(method(limit=self.page_size,
+                                offset=page * self.page_size))
+            for item in items:
+                if (watch.head is not None
+                        and getattr(item, watch.kind.item_id) in watch.head):
+                    reached = True
+                    break
+                new.append(item)
+            if reached or len(items) < self.page_size:
+                break
+        first = watch.head is None
+        watch.head = (tuple(getattr(item, watch.kind.item_id) for item in new)
+                      + (watch.head or ()))[:self.head_size]
+        return [] if first else new
+
+    def poll(self):
+        """Poll every target that is due now, and return the changes
+        found, oldest first for each target. If a target cannot be
+        polled, a FetchError is put in the list instead.
+        """
+        now = time.time()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, watch = heapq.heappop(self._heap)
+                if (self._watches.get(watch.target) is watch
+                        and watch.due <= now):
+                    due.append(watch)
+        changes = []
+        def poll(watch):
+            try:
+                return self._poll(watch)
+            except Exception as exc: # pylint: disable=broad-except
+                return FetchError(watch.target, exc)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for watch, result in zip(due, pool.map(poll, due)):
+                self.polls += 1
+                if isinstance(result, FetchError):
+                    changes.append(result)
+                    result = ()
+                changes.extend(watch.kind.change(target=watch.target, item=item)
+                               for item in reversed(result))
+                if result:
+                    watch.interval = max(self.min_interval, watch.interval / 2)
+                else:
+                    watch.interval = min(self.max_interval,
+                                         watch.interval * 1.5)
+                with self._lock:
+                    # Unwatched (or watched anew) while it was polled.
+                    if self._watches.get(watch.target) is watch:
+                        self._schedule(watch, time.time() + watch.interval
+                                       * random.uniform(0.9, 1.1))
+        return changes
+
+    def changes(self):
+        """Poll the targets as they become due, and yield every change,
+        until stop() is called or no target is left.
+        """
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            with self._lock:
+                while (self._heap and self._watches.get(
+                        self._heap[0][2].target) is not self._heap[0][2]):
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    return
+                due = self._heap[0][0]
+            if self._stopped.wait(max(0, due - time.time())):
+                return
+            yield from self.poll()
+
+    def stop(self):
+        """Make changes() return (from another thread)."""
+        self._stopped.set()
+
+    def checkpoint(self):
+        """Return the marks and intervals of the targets, as a dict."""
+        with self._lock:
+            watches = list(self._watches.values())
+        return {"watches": [
+            [watch.kind.name, getattr(watch.target, watch.kind.key),
+             None if watch.head is None else list(watch.head), watch.interval]
+            for watch in watches
+        ]}
+
+    @classmethod
+    def from_checkpoint(cls, state, **kwargs):
+        """Make a Watcher going on from state, a checkpoint(). kwargs are
+        given to Watcher().
+        """
+        watcher = cls(**kwargs)
+        kinds = {kind.name: kind for kind in _KINDS}
+        for name, key, head, interval in state["watches"]:
+            watcher.watch(kinds[name].cls(key),
+                          None if head is None else tuple(head), interval)
+        return watcher